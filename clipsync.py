@@ -0,0 +1,717 @@
+#!/usr/bin/env python3
+"""
+ClipSync Client  –  python3 stdlib only
+
+Als Modul:
+    import clipsync
+    c = clipsync.Client()                  # liest CLIPSYNC_HOST/_TOKEN/_CHANNEL
+    c.push("hallo welt")
+    print(c.latest()["content"])
+
+Als Kommando (dieselbe Ausgabe wie die pbpush/pbpull/pblist-Snippets):
+    python3 clipsync.py push "text" [label]     | echo text | python3 clipsync.py push
+    python3 clipsync.py pull [id] [-o pfad]
+    tail -f app.log | python3 clipsync.py push -f [label]   # Live-Eintrag
+    python3 clipsync.py pull -f [id]            # Live-Eintrag mitlesen
+    python3 clipsync.py list
+    python3 clipsync.py delete <id>
+    python3 clipsync.py export [--tar] > backup  # Online-Backup als Stream
+    python3 clipsync.py import backup
+    python3 clipsync.py daemon                  # hält Verbindungen + Cache offen
+
+- Verbindungen bleiben offen (Keep-Alive, Pool) → kein TLS-Handshake pro Aufruf
+- Läuft der Server auf demselben Rechner, geht alles über seinen Unix-Socket
+  (CLIPSYNC_SOCKET) – kein TCP, kein TLS, kein Token nötig
+- Inhalte werden unter ihrem Hash auf der Platte gecacht → erneutes Pullen
+  desselben Eintrags lädt nur noch die Metadaten
+- Wiederholt gepushte Textdateien (Logs, Notizen) gehen als Zeilen-Delta
+  auf den vorigen Push derselben Datei raus – Upload ∝ Änderung
+- Läuft `clipsync.py daemon`, reichen die Kommandos ihre Aufrufe über einen
+  lokalen Unix-Socket an ihn weiter und sparen sich Imports, Verbindungsaufbau
+  und Cache-Prüfung
+"""
+
+import os, sys, json, zlib, stat, socket, hashlib, threading
+
+CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "clipsync")
+SOCKET_PATH = os.path.join(os.environ.get("XDG_RUNTIME_DIR") or CACHE_DIR, "clipsync-daemon.sock")
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+CODE_EXTS = ('.py', '.js', '.ts', '.sh', '.json', '.xml', '.yaml', '.yml', '.sql', '.css', '.html')
+TEXT_EXTS = ('.log', '.md', '.conf', '.ini', '.toml')   # ohne MIME-Typ, aber Text (→ Delta-Pushes)
+
+
+def _is_local(host):
+    """True, wenn `host` eine Adresse dieses Rechners ist (bindbar)."""
+    try:
+        with socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET) as s:
+            s.bind((host, 0))
+        return True
+    except OSError:
+        return False
+
+
+def _server_socket(port):
+    """Unix-Socket des Servers auf `port` (Name wie im Server: clipsync-<port>.sock)."""
+    run = os.environ.get("XDG_RUNTIME_DIR")
+    return os.environ.get("CLIPSYNC_SOCKET") or (os.path.join(run, f"clipsync-{port}.sock") if run else "")
+
+
+def _own_socket(path):
+    """True, wenn `path` ein Socket des eigenen Users ist – sonst bekäme ein fremder Token und Inhalte."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    return stat.S_ISSOCK(st.st_mode) and st.st_uid == os.getuid()
+
+
+class ClipSyncError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def content_hash(content):
+    """Gleicher Hash wie im Server (BLAKE2b, 128 Bit)."""
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def make_delta(old, new):
+    """Zeilen-Delta von `old` nach `new` (Format siehe apply_delta im Server):
+    n > 0 = n Zeilen übernehmen, n < 0 = n Zeilen auslassen, Text = einfügen."""
+    import difflib
+    a, b = old.splitlines(True), new.splitlines(True)
+    # Gleicher Anfang/gleiches Ende vorab – bei wachsenden Logs bleibt für difflib kaum etwas übrig
+    pre = 0
+    while pre < len(a) and pre < len(b) and a[pre] == b[pre]:
+        pre += 1
+    post = 0
+    while post < len(a) - pre and post < len(b) - pre and a[-1 - post] == b[-1 - post]:
+        post += 1
+    ops = [pre] if pre else []
+    sm = difflib.SequenceMatcher(None, a[pre:len(a) - post], b[pre:len(b) - post])
+    for tag, i1, i2, j1, j2 in sm.get_opcodes():
+        if tag == "equal":
+            ops.append(i2 - i1)
+            continue
+        if i2 > i1:
+            ops.append(i1 - i2)
+        if j2 > j1:
+            ops.append("".join(b[pre + j1:pre + j2]))
+    if post:
+        ops.append(post)
+    return ops
+
+
+# ── Cache ────────────────────────────────────────────────────────────────────
+
+class Cache:
+    """Inhalte auf der Platte, Schlüssel = Inhalts-Hash. Größenbegrenzt (älteste zuerst raus)."""
+
+    BASES = "bases.json"   # Datei → Hash ihres letzten Pushes (Basis für Delta-Pushes)
+    MAX_BASES = 256
+
+    def __init__(self, path=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.size = None   # laufende Summe; None = noch nicht gezählt
+        self.lock = threading.Lock()
+
+    def _file(self, h):
+        return os.path.join(self.path, h[:2], h)
+
+    def get(self, h):
+        try:
+            with open(self._file(h), encoding="utf-8") as f:
+                content = f.read()
+        except (OSError, ValueError):
+            return None
+        # Beschädigte/abgeschnittene Dateien nie ausliefern
+        return content if content_hash(content) == h else None
+
+    def put(self, h, content):
+        if not h or content_hash(content) != h:
+            return
+        path = self._file(h)
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(content)
+        size = os.path.getsize(tmp)
+        os.replace(tmp, path)
+        # Nur beim ersten Mal und über dem Limit die Platte durchgehen
+        with self.lock:
+            if self.size is not None:
+                self.size += size
+                if self.size <= self.max_bytes:
+                    return
+        self.prune()
+
+    def base(self, key):
+        return self._bases().get(key)
+
+    def set_base(self, key, h):
+        bases = self._bases()
+        bases.pop(key, None)
+        bases[key] = h
+        while len(bases) > self.MAX_BASES:
+            bases.pop(next(iter(bases)))
+        os.makedirs(self.path, mode=0o700, exist_ok=True)
+        path = os.path.join(self.path, self.BASES)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(bases, f)
+        os.replace(tmp, path)
+
+    def _bases(self):
+        try:
+            with open(os.path.join(self.path, self.BASES), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def prune(self):
+        files = []
+        for root, _, names in os.walk(self.path):
+            for n in names:
+                if n == self.BASES:
+                    continue
+                p = os.path.join(root, n)
+                try:
+                    st = os.stat(p)
+                except OSError:
+                    continue
+                files.append((st.st_mtime, st.st_size, p))
+        total = sum(f[1] for f in files)
+        # Etwas Luft schaffen, damit nicht gleich der nächste put wieder aufräumt
+        target = self.max_bytes * 9 // 10 if total > self.max_bytes else total
+        for _, size, p in sorted(files):
+            if total <= target:
+                break
+            try:
+                os.unlink(p)
+                total -= size
+            except OSError:
+                pass
+        with self.lock:
+            self.size = total
+
+
+# ── HTTP-Client ──────────────────────────────────────────────────────────────
+
+class Client:
+    """ClipSync-API mit Verbindungs-Pool und Inhalts-Cache. Thread-sicher."""
+
+    POOL_SIZE = 4
+    DELTA_MIN = 4096   # kleinere Inhalte immer komplett pushen
+
+    def __init__(self, host=None, token=None, channel=None, cache=None, cafile=None, timeout=60):
+        # Erst hier importiert: die Kommandos im Daemon-Modus brauchen weder ssl noch http.client
+        import ssl, http.client
+        from urllib.parse import urlsplit
+        self._http = http.client
+        host = host or os.environ.get("CLIPSYNC_HOST") or "https://localhost:8765"
+        self.token = os.environ.get("CLIPSYNC_TOKEN", "") if token is None else token
+        channel = os.environ.get("CLIPSYNC_CHANNEL", "") if channel is None else channel
+        u = urlsplit(host)
+        self.netloc = u.netloc
+        self.https = u.scheme == "https"
+        self.base = f"/api/c/{channel}" if channel else "/api"
+        self.timeout = timeout
+        # Server auf diesem Rechner → dessen Unix-Socket statt TCP(+TLS)
+        sock = _server_socket(u.port or (443 if self.https else 80))
+        self.unix = sock if _own_socket(sock) and _is_local(u.hostname or "") else None
+        if self.https:
+            if cafile:
+                self.ctx = ssl.create_default_context(cafile=cafile)
+            else:
+                # wie die Shell-Snippets: selbstsigniertes Zertifikat akzeptieren
+                self.ctx = ssl.create_default_context()
+                self.ctx.check_hostname = False
+                self.ctx.verify_mode = ssl.CERT_NONE
+        self.cache = Cache() if cache is None else cache
+        self.idle = []
+        self.lock = threading.Lock()
+
+    # Pool
+
+    def _connect(self):
+        if self.unix:
+            s = socket.socket(socket.AF_UNIX)
+            s.settimeout(self.timeout)
+            try:
+                s.connect(self.unix)
+                conn = self._http.HTTPConnection("localhost", timeout=self.timeout)
+                conn.sock = s
+                return conn
+            except OSError:
+                s.close()
+                self.unix = None   # verwaister Socket → ab jetzt über TCP
+        if self.https:
+            return self._http.HTTPSConnection(self.netloc, timeout=self.timeout, context=self.ctx)
+        return self._http.HTTPConnection(self.netloc, timeout=self.timeout)
+
+    def _release(self, conn):
+        with self.lock:
+            if len(self.idle) < self.POOL_SIZE:
+                self.idle.append(conn)
+                return
+        conn.close()
+
+    def request(self, method, path, payload=None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8") if payload is not None else None
+        resp, data = self._send(method, path, body, {"Content-Type": "application/json"})
+        result = json.loads(data) if data else {}
+        if resp.status >= 400:
+            raise ClipSyncError(resp.status, result.get("error", resp.reason) if isinstance(result, dict) else resp.reason)
+        return result
+
+    def _send(self, method, path, body=None, headers=None):
+        headers = dict(headers or {})
+        if self.token:
+            headers["X-Token"] = self.token
+        while True:
+            with self.lock:
+                conn = self.idle.pop() if self.idle else None
+            reused = conn is not None
+            conn = conn or self._connect()
+            try:
+                conn.request(method, self.base + path, body=body, headers=headers)
+                resp = conn.getresponse()
+                data = resp.read()
+            except (self._http.HTTPException, ConnectionError, BrokenPipeError) as e:
+                conn.close()
+                if reused:
+                    continue   # Server hat die Leerlauf-Verbindung geschlossen → neu verbinden
+                raise ClipSyncError(0, f"Verbindungsfehler: {e}")
+            if resp.will_close:
+                conn.close()
+            else:
+                self._release(conn)
+            return resp, data
+
+    def close(self):
+        with self.lock:
+            idle, self.idle = self.idle, []
+        for conn in idle:
+            conn.close()
+
+    # API
+
+    def entries(self, meta=True, limit=None, before=None):
+        """Liste; mit meta=True ohne content (dafür size + preview) – deutlich kleiner."""
+        qs = []
+        if meta:
+            qs.append("fields=meta")
+        if limit:
+            qs.append(f"limit={int(limit)}")
+        if before:
+            qs.append(f"before={before}")
+        return self.request("GET", "/entries" + ("?" + "&".join(qs) if qs else ""))
+
+    def content(self, eid):
+        """Roher Inhalt eines Eintrags; komprimiert gespeicherte Inhalte kommen gzip-kodiert."""
+        resp, data = self._send("GET", f"/entry/{eid}/content", headers={"Accept-Encoding": "gzip"})
+        if resp.status >= 400:
+            raise ClipSyncError(resp.status, resp.reason)
+        if resp.getheader("Content-Encoding") == "gzip":
+            data = zlib.decompress(data, 47)
+        return data.decode("utf-8")
+
+    def get(self, eid=None):
+        """Eintrag per ID (oder neuesten). Inhalt kommt, wenn möglich, aus dem Cache."""
+        path = f"/entry/{eid}" if eid else "/latest"
+        meta = self.request("GET", path + "?fields=meta")
+        meta.pop("size", None)
+        meta.pop("preview", None)
+        content = self.cache.get(meta["hash"]) if meta.get("hash") else None
+        if content is None:
+            if not meta.get("hash"):   # älterer Server ohne Hash/Metadaten-Ansicht
+                return self.request("GET", path)
+            content = self.content(meta["id"])
+            self.cache.put(meta["hash"], content)
+        meta["content"] = content
+        return meta
+
+    def latest(self):
+        return self.get(None)
+
+    def push(self, content, label="", type=None, filename=None, base=None):
+        """Neuer Eintrag. Mit `base` (Hash eines früheren, gecachten Inhalts) geht,
+        wenn es sich lohnt, nur ein Zeilen-Delta raus; der Server baut den Inhalt
+        nach und prüft ihn per Hash. Klappt das nicht, wird komplett gepusht."""
+        payload = {"label": label}
+        if type:
+            payload["type"] = type
+        if filename:
+            payload["filename"] = filename
+        stripped = content.strip()
+        old = self.cache.get(base) if base and len(stripped) >= self.DELTA_MIN else None
+        result = None
+        if old is not None:
+            ops = make_delta(old, stripped)
+            if len(json.dumps(ops, ensure_ascii=False)) < len(stripped) // 2:
+                try:
+                    result = self.request("POST", "/push", dict(payload, base=base, delta=ops,
+                                                                 hash=content_hash(stripped)))
+                except ClipSyncError as e:
+                    if e.status != 409:   # 409: Basis weg oder Delta passt nicht
+                        raise
+        if result is None:
+            result = self.request("POST", "/push", dict(payload, content=content))
+        self.cache.put(result.get("hash"), stripped)
+        return result
+
+    def push_file(self, path, label=""):
+        """Datei pushen – Typ-Erkennung wie im pbpush-Snippet."""
+        import mimetypes, base64
+        filename = os.path.basename(path)
+        mime = mimetypes.guess_type(filename)[0] or \
+            ("text/plain" if filename.endswith(TEXT_EXTS) else "application/octet-stream")
+        with open(path, "rb") as f:
+            raw = f.read()
+        if mime.startswith("image/"):
+            return self.push(f"data:{mime};base64,{base64.b64encode(raw).decode()}",
+                             label or filename, "image", filename)
+        if mime.startswith("text/") or mime in ("application/json", "application/xml", "application/javascript"):
+            etype = "code" if filename.endswith(CODE_EXTS) else "file"
+            key = f"{self.netloc}{self.base}:{os.path.abspath(path)}"
+            result = self.push(raw.decode("utf-8", errors="replace"), label or filename, etype, filename,
+                               base=self.cache.base(key))
+            if result.get("hash"):
+                self.cache.set_base(key, result["hash"])
+            return result
+        return self.push(f"data:{mime};base64,{base64.b64encode(raw).decode()}",
+                         label or filename, "file", filename)
+
+    def delete(self, eid):
+        return self.request("DELETE", f"/entry/{eid}")
+
+    # Backup – eigene Verbindung, Daten fließen in Blöcken statt komplett durch den RAM
+
+    def _stream(self, method, path, body=None, headers=None):
+        headers = dict(headers or {})
+        if self.token:
+            headers["X-Token"] = self.token
+        conn = self._connect()
+        try:
+            conn.request(method, self.base + path, body=body, headers=headers)
+            return conn, conn.getresponse()
+        except (self._http.HTTPException, ConnectionError) as e:
+            conn.close()
+            raise ClipSyncError(0, f"Verbindungsfehler: {e}")
+
+    def export(self, out, tar=False):
+        """Konsistenten Schnappschuss (NDJSON oder tar) nach `out` (binär) schreiben."""
+        conn, resp = self._stream("GET", "/export" + ("?format=tar" if tar else ""))
+        try:
+            if resp.status >= 400:
+                raise ClipSyncError(resp.status, resp.reason)
+            while True:
+                chunk = resp.read(64 * 1024)
+                if not chunk:
+                    return
+                out.write(chunk)
+        except self._http.HTTPException as e:   # Stream ohne Ende-Chunk → Export abgebrochen
+            raise ClipSyncError(0, f"Export unvollständig: {e}")
+        finally:
+            conn.close()
+
+    def import_(self, f, size):
+        """Backup aus der Binärdatei `f` (Länge `size`) einspielen → {"added", "duplicate", "skipped", "invalid"}."""
+        conn, resp = self._stream("POST", "/import", f, {"Content-Length": str(size),
+                                                          "Content-Type": "application/octet-stream"})
+        try:
+            data = resp.read()
+        finally:
+            conn.close()
+        result = json.loads(data) if data else {}
+        if resp.status >= 400:
+            raise ClipSyncError(resp.status, result.get("error", resp.reason))
+        return result
+
+    def live(self, chunks, label=""):
+        """Live-Eintrag: jedes Stück aus `chunks` (Bytes) geht raus, sobald es da ist,
+        andere lesen mit follow() mit. Fertig ist er, wenn `chunks` endet → wie push()."""
+        from urllib.parse import quote
+        conn, resp = self._stream("POST", "/live?label=" + quote(label), chunks,
+                                  {"Content-Type": "text/plain; charset=utf-8"})
+        try:
+            data = resp.read()
+        finally:
+            conn.close()
+        result = json.loads(data) if data else {}
+        if resp.status >= 400:
+            raise ClipSyncError(resp.status, result.get("error", resp.reason))
+        return result
+
+    def follow(self, eid=None):
+        """Live-Eintrag `eid` (ohne: den neuesten) mitlesen → Bytes-Stücke, bis er fertig ist.
+
+        Ist er schon fertig, kommt einmal der ganze Inhalt.
+        """
+        if eid is None:
+            live = self.request("GET", "/live")["live"]
+            if not live:
+                raise ClipSyncError(404, "kein Live-Eintrag")
+            eid = live[0]["id"]
+        conn, resp = self._stream("GET", f"/live/{eid}")
+        try:
+            if resp.status >= 400:
+                raise ClipSyncError(resp.status, resp.reason)
+            if conn.sock:
+                conn.sock.settimeout(None)   # ein ruhiger Erzeuger ist kein Fehler
+            while True:
+                chunk = resp.read1(64 * 1024)
+                if not chunk:
+                    return
+                yield chunk
+        finally:
+            conn.close()
+
+
+# ── Daemon ───────────────────────────────────────────────────────────────────
+
+DAEMON_CALLS = ("entries", "get", "latest", "push", "push_file", "delete")
+
+
+class DaemonClient:
+    """Gleiche Methoden wie Client, ausgeführt vom laufenden Daemon."""
+
+    def __init__(self, path=SOCKET_PATH, host=None, token=None, channel=None):
+        self.conn = [host or os.environ.get("CLIPSYNC_HOST", ""),
+                     os.environ.get("CLIPSYNC_TOKEN", "") if token is None else token,
+                     os.environ.get("CLIPSYNC_CHANNEL", "") if channel is None else channel]
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(path)
+        self.rfile = self.sock.makefile("rb")
+
+    def _call(self, name, *args):
+        req = {"call": name, "args": args, "conn": self.conn}
+        self.sock.sendall(json.dumps(req, ensure_ascii=False).encode("utf-8") + b"\n")
+        resp = json.loads(self.rfile.readline() or b'{"ok": false, "error": "Daemon beendet"}')
+        if not resp["ok"]:
+            raise ClipSyncError(resp.get("status", 0), resp["error"])
+        return resp["result"]
+
+    def __getattr__(self, name):
+        if name not in DAEMON_CALLS:
+            raise AttributeError(name)
+        return lambda *args: self._call(name, *args)
+
+    def close(self):
+        self.sock.close()
+
+
+def connect():
+    """Daemon falls erreichbar, sonst direkter Client."""
+    if os.path.exists(SOCKET_PATH):
+        try:
+            return DaemonClient()
+        except OSError:
+            pass
+    return Client()
+
+
+def serve_daemon(path=SOCKET_PATH):
+    import socketserver
+    try:
+        DaemonClient(path).close()
+        print(f"Daemon läuft bereits: {path}", file=sys.stderr)
+        return
+    except OSError:
+        pass
+    clients = {}
+    clients_lock = threading.Lock()
+
+    def client_for(conn):
+        key = tuple(conn)
+        with clients_lock:
+            if key not in clients:
+                clients[key] = Client(*key)
+            return clients[key]
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                try:
+                    req = json.loads(line)
+                    if req["call"] not in DAEMON_CALLS:
+                        raise ValueError(f"unbekannter Aufruf: {req['call']}")
+                    result = getattr(client_for(req["conn"]), req["call"])(*req["args"])
+                    resp = {"ok": True, "result": result}
+                except ClipSyncError as e:
+                    resp = {"ok": False, "error": str(e), "status": e.status}
+                except Exception as e:
+                    resp = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+                self.wfile.write(json.dumps(resp, ensure_ascii=False).encode("utf-8") + b"\n")
+
+    class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+    try:
+        os.unlink(path)   # verwaister Socket eines abgestürzten Daemons
+    except OSError:
+        pass
+    old_umask = os.umask(0o077)   # Socket nur für den eigenen User
+    try:
+        server = Server(path, Handler)
+    finally:
+        os.umask(old_umask)
+    print(f"ClipSync-Daemon lauscht auf {path}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.unlink(path)
+
+
+# ── Kommandos ────────────────────────────────────────────────────────────────
+
+def _stdin_chunks():
+    try:
+        yield from iter(lambda: os.read(0, 65536), b"")
+    except KeyboardInterrupt:
+        pass   # Strg+C beendet nur den Live-Eintrag
+
+
+def cmd_push(client, args):
+    arg = args[0] if args else ""
+    label = args[1] if len(args) > 1 else ""
+    if arg == "-f":
+        resp = client.live(_stdin_chunks(), label)
+        print(f"OK  id={resp.get('id','?')}  type={resp.get('type','?')}  live={resp.get('size',0):,} Bytes")
+        return
+    if arg and os.path.isfile(arg):
+        resp = client.push_file(os.path.abspath(arg), label)
+    elif not sys.stdin.isatty() and not arg:
+        resp = client.push(sys.stdin.read(), label)
+    elif arg:
+        resp = client.push(arg, label)
+    else:
+        print("Verwendung: pbpush 'text' | pbpush datei.zip | echo text | pbpush", file=sys.stderr)
+        return 1
+    print(f"OK  id={resp.get('id','?')}  type={resp.get('type','?')}")
+
+
+def cmd_pull(client, args):
+    import base64
+    a1, a2, a3 = (list(args) + ["", "", ""])[:3]
+    if a1 == "-f":
+        try:
+            for chunk in client.follow(a2 or None):
+                sys.stdout.buffer.write(chunk)
+                sys.stdout.buffer.flush()
+        except KeyboardInterrupt:
+            pass
+        return
+    entry_id = None
+    outpath = None
+    if a1 == "-o":
+        outpath = a2 if a2 else "."
+    elif a1 and not a1.startswith("-"):
+        entry_id = a1
+        if a2 == "-o":
+            outpath = a3 if a3 else "."
+
+    e        = client.get(entry_id)
+    content  = e.get("content", "")
+    filename = e.get("filename") or e.get("label") or "clipsync_download"
+    is_bin   = content.startswith("data:") and ";base64," in content
+
+    if outpath is not None:
+        if outpath == "." or outpath.endswith("/") or os.path.isdir(outpath):
+            dest = os.path.join(outpath, filename)
+        else:
+            dest = outpath
+        os.makedirs(os.path.dirname(os.path.abspath(dest)), exist_ok=True)
+        if is_bin:
+            raw = base64.b64decode(content.split(";base64,", 1)[1])
+            with open(dest, "wb") as f: f.write(raw)
+            print(f"Gespeichert: {dest}  ({len(raw):,} Bytes)")
+        else:
+            with open(dest, "w", encoding="utf-8") as f: f.write(content)
+            print(f"Gespeichert: {dest}  ({len(content):,} Zeichen)")
+    else:
+        if is_bin:
+            print(f"[Binärdatei: {filename}]  zum Speichern: pbpull -o {filename}")
+        else:
+            print(content)
+
+
+def cmd_list(client, args):
+    import datetime
+    data = client.entries(meta=True, limit=30)
+    print(f"{'ID':26}  {'Typ':6}  {'Größe':8}  {'Zeit':14}  Inhalt/Datei")
+    print("─" * 86)
+    for e in data.get("entries", []):
+        t  = e.get("type", "?")
+        c  = e.get("preview", "")
+        n  = e.get("size", 0)
+        fn = e.get("filename", "") or e.get("label", "")
+        ts = datetime.datetime.fromtimestamp(e.get("ts", 0) // 1000).strftime("%d.%m %H:%M")
+        sz = f"{n//1024}KB" if n > 1024 else f"{n}B"
+        if c.startswith("data:") and ";base64," in c:
+            preview = f"[binary] {fn}"
+        else:
+            preview = (fn + ": " if fn else "") + c[:40].replace("\n", " ")
+        print(f"{e['id']:26}  {t:6}  {sz:8}  {ts}  {preview}")
+
+
+def cmd_delete(client, args):
+    if not args:
+        print("Verwendung: clipsync.py delete <id>", file=sys.stderr)
+        return 1
+    client.delete(args[0])
+    print(f"Gelöscht: {args[0]}")
+
+
+def cmd_export(client, args):
+    tar = "--tar" in args
+    if sys.stdout.isatty():
+        print("Verwendung: clipsync.py export [--tar] > backup", file=sys.stderr)
+        return 1
+    client.export(sys.stdout.buffer, tar)
+    sys.stdout.buffer.flush()
+
+
+def cmd_import(client, args):
+    if not args or not os.path.isfile(args[0]):
+        print("Verwendung: clipsync.py import <backup>", file=sys.stderr)
+        return 1
+    with open(args[0], "rb") as f:
+        r = client.import_(f, os.fstat(f.fileno()).st_size)
+    print(f"Import: {r.get('added', 0)} neu, {r.get('duplicate', 0)} doppelt, "
+          f"{r.get('skipped', 0)} zu alt, {r.get('invalid', 0)} ungültig")
+
+
+COMMANDS = {"push": cmd_push, "pull": cmd_pull, "list": cmd_list, "delete": cmd_delete,
+            "export": cmd_export, "import": cmd_import}
+STREAMING = ("export", "import")   # laufen nie über den Daemon (ebenso push/pull -f)
+
+
+def main(argv):
+    if argv and argv[0] == "daemon":
+        serve_daemon()
+        return 0
+    if not argv or argv[0] not in COMMANDS:
+        print("Verwendung: clipsync.py push|pull|list|delete|export|import|daemon …", file=sys.stderr)
+        return 1
+    client = Client() if argv[0] in STREAMING or argv[1:2] == ["-f"] else connect()
+    try:
+        return COMMANDS[argv[0]](client, argv[1:]) or 0
+    except ClipSyncError as e:
+        print(f"Fehler: {e}", file=sys.stderr)
+        return 1
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -11,6 +11,19 @@ r"""
 ║    CLIPSYNC_HTTPS  = "1"   (Standard, "0" für HTTP) ║
 ║    CLIPSYNC_CERT   = "clipsync.crt"  (eigenes Cert)║
 ║    CLIPSYNC_KEY    = "clipsync.key"  (eigener Key) ║
+║    CLIPSYNC_TLS13  = "0"   ("1" = nur TLS 1.3)     ║
+║    CLIPSYNC_RATE_PUSH  = 120  (Pushes/min, 0 = aus)║
+║    CLIPSYNC_RATE_READ  = 600  (Reads/min, 0 = aus) ║
+║    CLIPSYNC_RATE_BYTES = 200  (MB Upload/min)      ║
+║    CLIPSYNC_MAX_INFLIGHT = 32 (parallele Requests) ║
+║    CLIPSYNC_CHANNELS = "team=tok1,ops=tok2:500"    ║
+║    CLIPSYNC_COMPRESS_MIN = 4096 (Bytes, 0 = aus)   ║
+║    CLIPSYNC_BODY_CACHE = 0  (MB, >0 = Sparmodus)   ║
+║    CLIPSYNC_DELTA_CHAIN = 0 (max. Delta-Kette)     ║
+║    CLIPSYNC_LIVE_BUFFER = 1 (MB je Live-Eintrag)   ║
+║    CLIPSYNC_PEERS  = "https://buero:8765#token,…"  ║
+║    CLIPSYNC_SOCKET = "…/clipsync-<port>.sock"      ║
+║    CLIPSYNC_DEBUG  = "0"   ("1" = /debug/…)        ║
 ╠════════════════════════════════════════════════════╣
 ║  Beispiele:                                        ║
 ║    python3 clipsync_server.py                      ║
@@ -24,9 +37,20 @@ Browser zeigt einmalig eine Warnung → "Trotzdem fortfahren" klicken
 → danach dauerhaft gespeichert.
 """
 
-import os, json, time, mimetypes, base64, ssl, subprocess, socket
+import time
+STARTED = time.perf_counter()   # für "Bereit nach … ms" im Start-Banner
+
+import os, re, json, hashlib, zlib, mimetypes, base64, ssl, subprocess, socket, threading, collections
+import collections.abc, contextlib, mmap, io, stat, sys, tarfile
+try:
+    import lzma   # optional – nicht jedes Python ist mit liblzma gebaut
+except ImportError:
+    lzma = None
+import http.client
+from http.cookies import SimpleCookie
 from http.server import HTTPServer, BaseHTTPRequestHandler
-from urllib.parse import urlparse, parse_qs
+from socketserver import ThreadingMixIn, UnixStreamServer
+from urllib.parse import urlparse, urlsplit, parse_qs
 
 PORT      = int(os.environ.get("CLIPSYNC_PORT", 8765))
 HOST      = os.environ.get("CLIPSYNC_HOST", "0.0.0.0")
@@ -34,20 +58,55 @@ TOKEN     = os.environ.get("CLIPSYNC_TOKEN", "")
 USE_HTTPS = os.environ.get("CLIPSYNC_HTTPS", "1").strip() not in ("0", "false", "no")
 CERT_FILE = os.environ.get("CLIPSYNC_CERT", os.path.join(os.path.dirname(os.path.abspath(__file__)), "clipsync.crt"))
 KEY_FILE  = os.environ.get("CLIPSYNC_KEY",  os.path.join(os.path.dirname(os.path.abspath(__file__)), "clipsync.key"))
+TLS13_ONLY = os.environ.get("CLIPSYNC_TLS13", "0").strip() in ("1", "true", "yes")
 DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "clipsync_data.json")
+CLIENT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "clipsync.py")
 MAX_ENTRIES = 100
+# Benannte Kanäle: "name=token[:max_entries],..." – jeder mit eigener Datei und eigenem Token
+CHANNELS_SPEC = os.environ.get("CLIPSYNC_CHANNELS", "")
+# Inhalte ab dieser Größe (UTF-8-Bytes) komprimiert als Blob-Datei ablegen
+COMPRESS_MIN = int(os.environ.get("CLIPSYNC_COMPRESS_MIN", 4096))
+LZMA_MAX     = 8 * 1024 * 1024   # darüber ist lzma zu langsam für einen Push
+# Delta-Pushes als Kette ablegen (max. Länge, danach wieder voll); 0 = immer voll speichern
+DELTA_CHAIN  = int(os.environ.get("CLIPSYNC_DELTA_CHAIN", 0))
+# Sparmodus: >0 legt alle Inhalte auf die Platte, im RAM nur Metadaten + LRU dieser Größe (MB)
+BODY_CACHE   = int(os.environ.get("CLIPSYNC_BODY_CACHE", 0)) * 1024 * 1024
+# Live-Einträge (POST /api/live): so viel vom Ende bleibt je Eintrag im Ringpuffer (MB)
+LIVE_BUFFER  = int(float(os.environ.get("CLIPSYNC_LIVE_BUFFER", 1)) * 1024 * 1024)
+# Replikation: andere ClipSync-Server, deren Kanäle gespiegelt werden ("url#token,…")
+PEERS_SPEC   = os.environ.get("CLIPSYNC_PEERS", "")
+
+# Zusätzlicher Listener für Clients auf diesem Rechner (ohne TLS, Auth über Dateirechte); "0" = aus
+# Nur im eigenen XDG_RUNTIME_DIR (0700) – in /tmp könnte ein anderer User den Pfad besetzen.
+# Der Port im Namen sagt Clients, welcher Server dahinter steckt (mehrere pro Rechner).
+SOCKET_PATH  = os.environ.get("CLIPSYNC_SOCKET") or \
+    (os.path.join(os.environ["XDG_RUNTIME_DIR"], f"clipsync-{PORT}.sock") if os.environ.get("XDG_RUNTIME_DIR") else "0")
+
+# Rate-Limits pro Client-IP und pro Token (je Minute, 0 = deaktiviert)
+RATE_PUSH    = float(os.environ.get("CLIPSYNC_RATE_PUSH", 120))
+RATE_READ    = float(os.environ.get("CLIPSYNC_RATE_READ", 600))
+RATE_BYTES   = float(os.environ.get("CLIPSYNC_RATE_BYTES", 200)) * 1024 * 1024
+MAX_INFLIGHT = int(os.environ.get("CLIPSYNC_MAX_INFLIGHT", 32))
+
+# /debug/profile und /debug/slow (plus Phasen-Zeiten je Request); aus = keinerlei Messung
+DEBUG = os.environ.get("CLIPSYNC_DEBUG", "0").strip() in ("1", "true", "yes")
 
 # ── TLS / Certificate helpers ─────────────────────────────────────────────────
 
+_local_ip = None
+
 def get_local_ip():
+    global _local_ip
+    if _local_ip:
+        return _local_ip
     try:
         s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         s.connect(("8.8.8.8", 80))
-        ip = s.getsockname()[0]
+        _local_ip = s.getsockname()[0]
         s.close()
-        return ip
     except:
-        return "127.0.0.1"
+        _local_ip = "127.0.0.1"
+    return _local_ip
 
 def ensure_cert():
     """Generiert ein selbstsigniertes Zertifikat falls noch nicht vorhanden."""
@@ -102,26 +161,849 @@ DNS.2 = {hostname}
         print(f"  ✗ Zertifikat-Fehler: {e}")
         return False
 
-def wrap_https(server):
-    """Wraps den HTTPServer-Socket mit TLS."""
-    ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
-    ctx.minimum_version = ssl.TLSVersion.TLSv1_2
-    ctx.load_cert_chain(certfile=CERT_FILE, keyfile=KEY_FILE)
-    server.socket = ctx.wrap_socket(server.socket, server_side=True)
-    return server
+class TLSConfig:
+    """Server-SSLContext, einmal gebaut und für alle Verbindungen wiederverwendet.
+
+    ECDHE-only Cipher (Forward Secrecy), Session-Tickets und der Session-Cache
+    von OpenSSL bleiben aktiv → wiederkehrende Clients sparen den vollen
+    Handshake. Ändern sich Zertifikat oder Key auf der Platte, wird ein neuer
+    Context gebaut und atomar getauscht – ohne Neustart.
+    """
+
+    CIPHERS = "ECDHE+AESGCM:ECDHE+CHACHA20"
+
+    def __init__(self, certfile, keyfile, tls13_only=False):
+        self.certfile = certfile
+        self.keyfile = keyfile
+        self.tls13_only = tls13_only
+        self.stamp = self._stamp()
+        self.context = self._build()
+
+    def _stamp(self):
+        return tuple(os.stat(p).st_mtime_ns for p in (self.certfile, self.keyfile))
+
+    def _build(self):
+        ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        ctx.minimum_version = ssl.TLSVersion.TLSv1_3 if self.tls13_only else ssl.TLSVersion.TLSv1_2
+        ctx.set_ciphers(self.CIPHERS)   # TLS 1.3-Suiten sind ohnehin alle (EC)DHE
+        ctx.options |= ssl.OP_NO_COMPRESSION | ssl.OP_CIPHER_SERVER_PREFERENCE | ssl.OP_SINGLE_ECDH_USE
+        ctx.options &= ~ssl.OP_NO_TICKET
+        ctx.load_cert_chain(certfile=self.certfile, keyfile=self.keyfile)
+        return ctx
+
+    def wrap(self, sock):
+        sock.settimeout(30)   # hängende Handshakes nicht ewig halten
+        conn = self.context.wrap_socket(sock, server_side=True)
+        conn.settimeout(None)
+        return conn
+
+    def reload_if_changed(self):
+        try:
+            stamp = self._stamp()
+            if stamp == self.stamp:
+                return False
+            self.context = self._build()
+        except (OSError, ssl.SSLError) as e:
+            # z.B. Cert schon neu, Key noch nicht → alten Context behalten, später erneut
+            print(f"  ✗ Zertifikat-Reload fehlgeschlagen: {e}")
+            return False
+        self.stamp = stamp
+        print(f"  ✓ Zertifikat neu geladen: {self.certfile}")
+        return True
+
+    def watch(self, interval=5):
+        def loop():
+            while True:
+                time.sleep(interval)
+                self.reload_if_changed()
+        threading.Thread(target=loop, name="cert-watch", daemon=True).start()
 
 # ── Data helpers ─────────────────────────────────────────────────────────────
 
-def load():
-    try:
-        with open(DATA_FILE, encoding="utf-8") as f:
-            return json.load(f)
-    except:
-        return []
+def encode_json(data):
+    """Kompaktes UTF-8-JSON – Umlaute, Emoji, CJK ohne 6-Byte-\\uXXXX-Escapes."""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=_json_default).encode("utf-8")
+
+def _json_default(o):
+    if isinstance(o, Entry):
+        return dict(o)
+    raise TypeError(f"{type(o).__name__} ist nicht JSON-serialisierbar")
+
+def encode_list(frags, **extra):
+    """{"entries":[…],…} direkt aus vorkodierten Eintrags-Fragmenten zusammensetzen."""
+    tail = b"".join(b',"%s":%s' % (k.encode(), encode_json(v)) for k, v in extra.items())
+    return b'{"entries":[' + b",".join(frags) + b"]" + tail + b"}"
+
+def content_hash(content):
+    """Inhalts-Hash (BLAKE2b, 128 Bit) – Schlüssel für Client-Caches und Dedup."""
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+def entry_meta(e, head=None):
+    """Eintrag ohne Inhalt, dafür mit Größe und Vorschau – für Listen und Cache-Prüfungen.
+
+    Bei dataURLs enthält die Vorschau nur den Header ("data:image/png;base64,").
+    Für komprimierte Einträge reicht als `head` der Anfang des Inhalts.
+    """
+    c = e.get("content", "") if head is None else head
+    meta = {k: v for k, v in e.items() if k not in ("content", "enc")}
+    meta.setdefault("size", len(c))
+    meta["preview"] = c[:c.find(",") + 1] if c.startswith("data:") else c[:80]
+    return meta
+
+def replication_meta(e):
+    """Eintrag ohne Inhalt und interne Speicherfelder – für den Replikations-Feed."""
+    return {k: v for k, v in e.items() if k not in ("content", "enc", "size")}
+
+def compress_content(raw):
+    """Algorithmus nach Komprimierbarkeit wählen → ("gzip"|"lzma", bytes) oder None.
+
+    gzip (als fertiger gzip-Stream) kann unverändert als Content-Encoding: gzip
+    ausgeliefert werden und reicht bei gut komprimierbarem Text. Nur wenn gzip
+    mäßig abschneidet, lohnt der Versuch mit lzma.
+    """
+    if COMPRESS_MIN <= 0 or len(raw) < COMPRESS_MIN:
+        return None
+    z = zlib.compressobj(6, zlib.DEFLATED, 31)   # wbits 31 = gzip-Format
+    gz = z.compress(raw) + z.flush()
+    if len(gz) > len(raw) * 0.9:
+        return None   # kaum komprimierbar, Rohform behalten
+    if lzma and len(raw) <= LZMA_MAX and len(gz) > len(raw) * 0.3:
+        xz = lzma.compress(raw, preset=6)
+        if len(xz) < len(gz) * 0.85:
+            return "lzma", xz
+    return "gzip", gz
+
+def decompress_content(enc, data, max_length=-1):
+    """Gegenstück zu compress_content; mit max_length nur den Anfang (für Vorschauen)."""
+    if enc == "raw":   # Sparmodus: unkomprimierbar, trotzdem als Blob auf der Platte
+        return bytes(data[:max_length] if max_length > 0 else data)
+    if enc == "gzip":
+        d = zlib.decompressobj(47)
+        return d.decompress(data, max_length) if max_length > 0 else d.decompress(data) + d.flush()
+    if enc == "lzma" and lzma:
+        return lzma.LZMADecompressor().decompress(data, max_length)
+    raise ValueError(f"unbekannte Kompression: {enc}")
+
+def apply_delta(base, ops):
+    """Zeilen-Delta auf `base` anwenden (Gegenstück zu clipsync.make_delta).
+
+    ops: n > 0 übernimmt die nächsten n Zeilen der Basis, n < 0 überspringt
+    n Zeilen, ein String wird unverändert eingefügt.
+    """
+    if not isinstance(ops, list):
+        raise ValueError("ungültiges Delta")
+    lines = base.splitlines(True)
+    out, pos = [], 0
+    for op in ops:
+        if isinstance(op, str):
+            out.append(op)
+        elif isinstance(op, int) and not isinstance(op, bool):
+            if pos + abs(op) > len(lines):
+                raise ValueError("Delta passt nicht zur Basis")
+            if op > 0:
+                out.extend(lines[pos:pos + op])
+            pos += abs(op)
+        else:
+            raise ValueError("ungültiges Delta")
+    return "".join(out)
+
+class Entry(collections.abc.MutableMapping):
+    """Eintrag als kompakter Datensatz: __slots__ statt dict, verhält sich aber wie eines.
+
+    Bei 10.000 Einträgen spart das gut die Hälfte des Metadaten-Speichers.
+    Unbekannte Felder (z.B. von neueren Peers) landen in `extra`.
+    """
+
+    FIELDS = ("id", "content", "type", "label", "filename", "ts", "hash", "enc", "size")
+    __slots__ = FIELDS + ("extra",)
+
+    def __init__(self, data=()):
+        self.extra = None
+        for k, v in dict(data).items():
+            self[k] = v
+
+    def __getitem__(self, k):
+        if k in self.FIELDS:
+            try:
+                return getattr(self, k)
+            except AttributeError:
+                raise KeyError(k) from None
+        if self.extra and k in self.extra:
+            return self.extra[k]
+        raise KeyError(k)
+
+    def __setitem__(self, k, v):
+        if k in self.FIELDS:
+            setattr(self, k, v)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[k] = v
+
+    def __delitem__(self, k):
+        if k in self.FIELDS:
+            try:
+                delattr(self, k)
+            except AttributeError:
+                raise KeyError(k) from None
+        elif self.extra and k in self.extra:
+            del self.extra[k]
+        else:
+            raise KeyError(k)
+
+    def __iter__(self):
+        for k in self.FIELDS:
+            if hasattr(self, k):
+                yield k
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"Entry({dict(self)!r})"
+
+class BodyCache:
+    """Größenbegrenzter LRU-Cache für Inhalte, Schlüssel ist der Inhalts-Hash.
+
+    Mit max_bytes=0 ist er aus, get() lädt dann jedes Mal direkt. Größe in
+    Zeichen gerechnet – bei dataURLs/ASCII entspricht das den Bytes.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.items = collections.OrderedDict()   # hash → content
+        self.bytes = 0
+        self.hits = self.misses = self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, key, load):
+        if not self.max_bytes:
+            return load()
+        with self.lock:
+            value = self.items.get(key)
+            if value is not None:
+                self.items.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+        value = load()   # ohne Lock – Plattenzugriff hält andere Leser nicht auf
+        # Einzelne Riesen-Inhalte würden den ganzen Cache verdrängen
+        if len(value) <= self.max_bytes // 4:
+            with self.lock:
+                if key not in self.items:
+                    self.items[key] = value
+                    self.bytes += len(value)
+                    while self.bytes > self.max_bytes:
+                        _, old = self.items.popitem(last=False)
+                        self.bytes -= len(old)
+                        self.evictions += 1
+        return value
+
+    def discard(self, key):
+        with self.lock:
+            value = self.items.pop(key, None)
+            if value is not None:
+                self.bytes -= len(value)
+
+    def stats(self):
+        with self.lock:
+            total = self.hits + self.misses
+            return {"max_bytes": self.max_bytes, "bytes": self.bytes, "items": len(self.items),
+                    "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "hit_rate": round(self.hits / total, 3) if total else None}
+
+BODIES = BodyCache(BODY_CACHE)
+
+class LiveStream:
+    """Ein Eintrag, der noch wächst (POST /api/live, z.B. `tail -f log | pbpush -f`).
+
+    Gehalten werden nur die letzten `cap` Bytes (Ringpuffer). Der Schreiber
+    hängt an und weckt die Leser, wartet aber nie auf sie: jeder Leser hat
+    seine eigene Byte-Position, wer zu weit zurückfällt, springt nach vorn.
+    """
+
+    def __init__(self, eid, label, cap):
+        self.id = eid
+        self.label = label
+        self.ts = IdGenerator.timestamp(eid)
+        self.cap = cap
+        self.buf = bytearray()
+        self.end = 0          # Bytes seit Beginn – Leser-Positionen zählen absolut
+        self.done = False
+        self.cond = threading.Condition()
+
+    @property
+    def start(self):
+        return self.end - len(self.buf)
+
+    def append(self, data):
+        with self.cond:
+            self.buf += data
+            if len(self.buf) > self.cap:
+                del self.buf[:len(self.buf) - self.cap]   # vorne löschen ist bei bytearray billig
+            self.end += len(data)
+            self.cond.notify_all()
+
+    def close(self):
+        with self.cond:
+            self.done = True
+            self.cond.notify_all()
+
+    def read(self, pos, timeout, limit=64 * 1024):
+        """Bytes ab `pos` → (Position der Daten, Daten); wartet bis zu `timeout` s.
+
+        Liegt `pos` nicht mehr im Puffer, beginnen die Daten später (am
+        nächsten UTF-8-Zeichen). Leere Daten und done → Ende.
+        """
+        with self.cond:
+            self.cond.wait_for(lambda: self.end > pos or self.done, timeout)
+            i = max(pos - self.start, 0)
+            if pos < self.start:
+                while i < len(self.buf) and 0x80 <= self.buf[i] < 0xC0:
+                    i += 1
+            return self.start + i, self.buf[i:i + limit]
+
+    def text(self):
+        """Endgültiger Inhalt; wurde vorne abgeschnitten, ab der ersten ganzen Zeile."""
+        with self.cond:
+            data, dropped = bytes(self.buf), self.start
+        if not dropped:
+            return data.decode("utf-8", "replace")
+        nl = data.find(b"\n")
+        cut = nl + 1 if nl >= 0 else len(data) - len(data.lstrip(bytes(range(0x80, 0xC0))))
+        return f"[… {dropped + cut:,} Bytes abgeschnitten …]\n" + data[cut:].decode("utf-8", "replace")
+
+    def meta(self):
+        with self.cond:
+            tail, size = bytes(self.buf[-320:]), self.end
+        # Vorschau vom Ende her – bei einem Log interessiert die letzte Zeile
+        return {"id": self.id, "type": "text", "label": self.label, "ts": self.ts,
+                "size": size, "live": True, "preview": tail.decode("utf-8", "ignore")[-80:]}
+
+class Channel:
+    """Ein isolierter Eintrags-Speicher: eigener Token, eigenes Limit, eigene
+    Datei, eigenes Lock und eigener Change-Feed. Ein schwerer Kanal blockiert
+    damit nie die anderen."""
+
+    LOG_SIZE = 1000
+    TOMBSTONES = 10000
+    LIVE_STREAMS = 16   # gleichzeitige Live-Einträge
+    BLOB_EXT = {"gzip": ".gz", "lzma": ".xz", "raw": ".raw", "delta": ".delta"}
+
+    def __init__(self, name, token, max_entries, data_file):
+        self.name = name
+        self.token = token
+        self.max_entries = max_entries
+        self.data_file = data_file
+        # Komprimierte Inhalte (im Sparmodus alle) liegen als <hash>.gz/.xz/.raw
+        # hier statt im JSON und im RAM
+        self.blob_dir = os.path.splitext(data_file)[0] + ".blobs"
+        self.refs = collections.Counter()   # hash → Anzahl Einträge, die den Blob nutzen
+        self.blob_enc = {}                  # hash → enc des Blobs (genau einer je Hash)
+        self.by_hash = collections.defaultdict(set)   # hash → ids (Blob-Abgleich bei Replikation)
+        # Während eines Exports bleiben Blob-Dateien liegen, gelöscht wird danach
+        self.pins = 0
+        self.doomed = []
+        self.delta_base = {}   # hash eines Delta-Blobs → (hash, enc) seiner Basis
+        self.live = {}         # id → LiveStream, solange der Erzeuger noch schreibt
+        # Gelöschte IDs merken, damit Replikation sie nicht wiederbelebt
+        self.tombstone_file = os.path.splitext(data_file)[0] + ".tombstones.json"
+        self.tombstones = collections.OrderedDict.fromkeys(self._read_json(self.tombstone_file, []))
+        self.peers_file = os.path.splitext(data_file)[0] + ".peers.json"
+        self.peer_cursors = self._read_json(self.peers_file, {})
+        self.peers_lock = threading.Lock()
+        self.lock = threading.Lock()   # serialisiert Änderungen + save zwischen Request-Threads
+        self.changed = threading.Condition(self.lock)
+        # Startwert aus der Uhr, damit Versionen über Neustarts hinweg (meist) steigen
+        self.version = int(time.time() * 1000)
+        self.log = collections.deque(maxlen=self.LOG_SIZE)
+        # Neueste zuerst. Copy-on-write: Änderungen ersetzen die Liste, Leser
+        # halten so immer einen konsistenten Stand ohne Lock.
+        self.entries = [Entry(e) for e in self.load()[:max_entries]]
+        self.index = {}
+        # Einträge sind unveränderlich → JSON-Fragmente (voll, nur Metadaten und
+        # Dateiform) einmal kodieren, danach nur noch joinen
+        self.frags = {}
+        self.meta_frags = {}
+        self.disk_frags = {}
+        migrated = False
+        for e in self.entries:
+            if "hash" not in e:   # Altbestand
+                e["hash"] = content_hash(e.get("content", ""))
+            if "enc" in e:
+                self.refs[e["hash"]] += 1
+                self.blob_enc.setdefault(e["hash"], e["enc"])
+            elif self._store(e, self._compress(e)):
+                migrated = True
+            self._cache(e)
+        # Delta-Blobs halten ihre Basis am Leben, auch wenn deren Eintrag weg ist
+        todo = {e["hash"] for e in self.entries if e.get("enc") == "delta"}
+        while todo:
+            h = todo.pop()
+            if h in self.delta_base:
+                continue
+            try:
+                d = self._delta_header(h)
+            except (OSError, ValueError) as err:
+                print(f"  ✗ Delta-Blob {h} [{name}] unlesbar: {err}")
+                continue
+            self.delta_base[h] = (d["base"], d["base_enc"])
+            self.refs[d["base"]] += 1
+            self.blob_enc.setdefault(d["base"], d["base_enc"])
+            if d["base_enc"] == "delta":
+                todo.add(d["base"])
+        if migrated:
+            self.save()
+
+    def load(self):
+        return self._read_json(self.data_file, [])
+
+    @staticmethod
+    def _read_json(path, default):
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except:
+            return default
+
+    @staticmethod
+    def _write_json(path, data):
+        with open(path + ".tmp", "wb") as f:
+            f.write(encode_json(data))
+        os.replace(path + ".tmp", path)
+
+    def save(self):
+        # Atomar ersetzen, damit parallele Leser nie eine halb geschriebene Datei sehen.
+        # Komprimierte Einträge stehen nur mit Metadaten (enc, size) in der Datei.
+        tmp = self.data_file + ".tmp"
+        frags = [self.disk_frags.get(e["id"]) or encode_json(e) for e in self.entries]
+        with open(tmp, "wb") as f:
+            f.write(b"[\n" + b",\n".join(frags) + b"\n]\n")
+        os.replace(tmp, self.data_file)
+
+    def get(self, eid):
+        return self.index.get(eid)
+
+    # Blobs (komprimierte Inhalte)
+
+    def blob_path(self, e):
+        return self._blob_file(e["hash"], e["enc"])
+
+    def _blob_file(self, h, enc):
+        return os.path.join(self.blob_dir, h + self.BLOB_EXT[enc])
+
+    def _compress(self, e):
+        """CPU-Teil der Kompression – läuft ohne Lock."""
+        if "content" not in e:
+            return None
+        raw = e["content"].encode("utf-8")
+        return compress_content(raw) or (("raw", raw) if BODIES.max_bytes else None)
+
+    def _pack_delta(self, e, base, ops):
+        """Eintrag als Delta auf den Eintrag `base` ablegen statt voll – nur wenn die
+        Basis selbst ein Blob ist, die Kette nicht zu lang wird und es sich lohnt.
+        Läuft ohne Lock; _insert prüft die Basis noch einmal."""
+        if not DELTA_CHAIN or "enc" not in base or e["hash"] in self.refs:
+            return None
+        size = len(e["content"].encode("utf-8"))
+        if size < max(COMPRESS_MIN, 1024):
+            return None
+        depth = self._delta_header(base["hash"])["depth"] + 1 if base["enc"] == "delta" else 1
+        if depth > DELTA_CHAIN:
+            return None   # regelmäßig wieder ein voller Schnappschuss
+        z = zlib.compressobj(6, zlib.DEFLATED, 31)
+        data = z.compress(encode_json({"base": base["hash"], "base_enc": base["enc"],
+                                       "depth": depth, "ops": ops})) + z.flush()
+        if len(data) > size // 4:
+            return None
+        return "delta", data, (base["hash"], base["enc"])
+
+    def _delta_header(self, h):
+        with open(self._blob_file(h, "delta"), "rb") as f:
+            return json.loads(zlib.decompress(f.read(), 47))
+
+    def _store(self, e, packed):
+        """Blob schreiben (falls neu) und Eintrag auf enc/size umstellen. Nur mit self.lock."""
+        if not packed:
+            return False
+        if e["hash"] in self.blob_enc:
+            # Inhalt liegt schon als Blob (evtl. anders kodiert) – den mitnutzen statt
+            # eine zweite Datei anzulegen, die der gemeinsame Zähler nie löschen würde
+            e["enc"] = self.blob_enc[e["hash"]]
+            e["size"] = len(e.pop("content"))
+            self.refs[e["hash"]] += 1
+            return True
+        e["enc"], data, *base = packed
+        path = self.blob_path(e)
+        if not os.path.exists(path):
+            os.makedirs(self.blob_dir, exist_ok=True)
+            with open(path + ".tmp", "wb") as f:
+                f.write(data)
+            os.replace(path + ".tmp", path)
+        e["size"] = len(e.pop("content"))
+        if base and not self.refs[e["hash"]]:   # erster Nutzer des Delta-Blobs hält die Basis fest
+            self.delta_base[e["hash"]] = base[0]
+            self.refs[base[0][0]] += 1
+        self.refs[e["hash"]] += 1
+        self.blob_enc[e["hash"]] = e["enc"]
+        return True
 
-def save(entries):
-    with open(DATA_FILE, "w", encoding="utf-8") as f:
-        json.dump(entries[:MAX_ENTRIES], f, ensure_ascii=True, indent=2)
+    def _release(self, e):
+        """Blob-Referenz abgeben, letzte löscht die Datei. Nur mit self.lock."""
+        if "enc" in e:
+            self._unref(e["hash"], e["enc"])
+
+    def _unref(self, h, enc):
+        self.refs[h] -= 1
+        if self.refs[h] > 0:
+            return
+        del self.refs[h]
+        self.blob_enc.pop(h, None)
+        BODIES.discard(h)
+        path = self._blob_file(h, enc)
+        if self.pins:
+            self.doomed.append((h, path))
+        else:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        base = self.delta_base.pop(h, None)
+        if base:
+            self._unref(*base)
+
+    @contextlib.contextmanager
+    def snapshot(self):
+        """Konsistenter Stand für Exporte, ohne Schreiber zu blockieren.
+
+        Die Eintragsliste ist copy-on-write und damit ohnehin stabil; solange
+        der Block läuft, löscht _release nur noch vor und räumt danach auf.
+        """
+        with self.lock:
+            self.pins += 1
+            entries = self.entries
+        try:
+            yield entries
+        finally:
+            with self.lock:
+                self.pins -= 1
+                if not self.pins:
+                    for h, path in self.doomed:
+                        if h not in self.refs:   # nicht inzwischen neu gepusht
+                            try:
+                                os.unlink(path)
+                            except OSError:
+                                pass
+                    self.doomed = []
+
+    def blob(self, e):
+        """(enc, komprimierte Bytes) oder (None, None) für unkomprimierte Einträge."""
+        if "enc" not in e:
+            return None, None
+        with open(self.blob_path(e), "rb") as f:
+            return e["enc"], f.read()
+
+    @contextlib.contextmanager
+    def _mapped(self, path):
+        """Blob per mmap – von der Platte kommt nur, was Dekompression/Dekodierung anfassen."""
+        with open(path, "rb") as f:
+            if not os.fstat(f.fileno()).st_size:
+                yield b""   # leere Datei lässt sich nicht mappen
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                yield m
+
+    def _read_body(self, e):
+        return self._read_blob(e["hash"], e["enc"])
+
+    def _read_blob(self, h, enc):
+        if enc == "delta":   # Basis rekursiv (Kette ist höchstens DELTA_CHAIN lang)
+            d = self._delta_header(h)
+            base = BODIES.get(d["base"], lambda: self._read_blob(d["base"], d["base_enc"]))
+            return apply_delta(base, d["ops"])
+        with self._mapped(self._blob_file(h, enc)) as data:
+            if enc == "raw":
+                return str(data, "utf-8")
+            return decompress_content(enc, data).decode("utf-8")
+
+    def content(self, e):
+        """Inhalt eines Eintrags – dekomprimiert erst hier, wenn er wirklich gebraucht wird."""
+        if "enc" not in e:
+            return e["content"]
+        return BODIES.get(e["hash"], lambda: self._read_body(e))
+
+    def full(self, e):
+        """Eintrag in API-Form (mit content, ohne interne Felder)."""
+        if "enc" not in e:
+            return e
+        out = {k: v for k, v in e.items() if k not in ("enc", "size")}
+        out["content"] = self.content(e)
+        return out
+
+    def meta(self, e):
+        if "enc" not in e:
+            return entry_meta(e)
+        if e["enc"] == "delta":
+            return entry_meta(e, self.content(e)[:400])
+        with self._mapped(self.blob_path(e)) as data:
+            head = decompress_content(e["enc"], data, 400).decode("utf-8", errors="ignore")
+        return entry_meta(e, head)
+
+    # Fragment-Caches
+
+    def _cache(self, e):
+        self.index[e["id"]] = e
+        self.by_hash[e["hash"]].add(e["id"])
+        if "enc" not in e:   # Volltext komprimierter Einträge bleibt bewusst nicht im RAM
+            self.frags[e["id"]] = self.disk_frags[e["id"]] = encode_json(e)
+        else:
+            self.disk_frags[e["id"]] = encode_json(e)
+        self.meta_frags[e["id"]] = encode_json(self.meta(e))
+
+    def _uncache(self, eid):
+        e = self.index.pop(eid, None)
+        if e is not None:
+            ids = self.by_hash[e["hash"]]
+            ids.discard(eid)
+            if not ids:
+                del self.by_hash[e["hash"]]
+        self.frags.pop(eid, None)
+        self.meta_frags.pop(eid, None)
+        self.disk_frags.pop(eid, None)
+
+    def encoded(self, entries, meta=False):
+        """Vorkodierte JSON-Fragmente zu `entries` (Fallback: frisch kodieren)."""
+        if meta:
+            frags = self.meta_frags
+            return [frags.get(e["id"]) or encode_json(self.meta(e)) for e in entries]
+        frags = self.frags
+        return [frags.get(e["id"]) or encode_json(self.full(e)) for e in entries]
+
+    # Änderungen
+
+    def _position(self, ts):
+        """Erster Index mit entries[i].ts <= ts (Liste ist nach ts absteigend sortiert)."""
+        entries = self.entries
+        lo, hi = 0, len(entries)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if entries[mid]["ts"] > ts:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def add(self, entry, delta=None):
+        """Eintrag nach ts einsortieren.
+
+        False, wenn die ID schon bekannt oder gelöscht ist oder der Eintrag zu
+        alt für das Limit wäre – replizierte Pushes sind damit idempotent.
+        Mit delta=(Basis-Eintrag, ops) wird er nach Möglichkeit als Delta gespeichert.
+        """
+        entry = Entry(entry)
+        packed = delta and self._pack_delta(entry, *delta) or self._compress(entry)
+        return self._add_packed([(entry, packed)]) == 1
+
+    def add_many(self, entries):
+        """Wie add() für mehrere Einträge, aber mit nur einem save(). → Anzahl neu."""
+        return self._add_packed([(e, self._compress(e)) for e in map(Entry, entries)])
+
+    def _add_packed(self, batch):
+        added = 0
+        with self.lock:
+            for entry, packed in batch:
+                added += self._insert(entry, packed)
+            if added:
+                self.save()
+        return added
+
+    def _insert(self, entry, packed):
+        """Nur mit self.lock."""
+        if entry["id"] in self.index or entry["id"] in self.tombstones:
+            return False
+        if packed and packed[0] == "delta" and (packed[2][0] not in self.refs or entry["hash"] in self.refs):
+            packed = self._compress(entry)   # Basis inzwischen weg oder Inhalt schon als Blob da
+        pos = self._position(entry["ts"])
+        if pos >= self.max_entries:
+            return False
+        self._store(entry, packed)
+        entries = self.entries[:pos] + [entry] + self.entries[pos:]
+        for old in entries[self.max_entries:]:
+            self._uncache(old["id"])
+            self._release(old)
+        self._cache(entry)
+        self.entries = entries[:self.max_entries]
+        self.record("push", entry["id"])
+        return True
+
+    def remove(self, eid, remote=False):
+        """Eintrag löschen. Mit remote=True (Replikation) wird auch eine hier
+        unbekannte ID als gelöscht vermerkt."""
+        return self.remove_many([eid], remote) > 0
+
+    def remove_many(self, eids, remote=False):
+        """Wie remove für viele IDs; Einträge und Tombstones werden nur einmal
+        geschrieben. Gibt die Zahl gelöschter Einträge zurück."""
+        with self.lock:
+            removed, dead = [], []
+            for eid in eids:
+                if eid in self.index:
+                    self._release(self.index[eid])
+                    self._uncache(eid)
+                    removed.append(eid)
+                elif not remote or eid in self.tombstones:
+                    continue
+                dead.append(eid)
+            if dead:
+                self._tombstone(dead)
+            if removed:
+                gone = set(removed)
+                self.entries = [e for e in self.entries if e["id"] not in gone]
+                self.save()
+                for eid in removed:
+                    self.record("delete", eid)
+            return len(removed)
+
+    def _tombstone(self, eids):
+        for eid in eids:
+            self.tombstones[eid] = None
+        while len(self.tombstones) > self.TOMBSTONES:
+            self.tombstones.popitem(last=False)
+        self._write_json(self.tombstone_file, list(self.tombstones))
+
+    def page(self, before=None, limit=None):
+        """Cursor-Pagination: bis zu `limit` Einträge älter als Eintrag `before`.
+
+        Die Liste ist nach ts absteigend sortiert (IDs sind zeitlich geordnet),
+        daher findet eine Binärsuche über ts die Cursor-Position.
+        """
+        entries = self.entries
+        start = 0
+        if before:
+            cursor = self.index.get(before)
+            if cursor is None:
+                return None
+            lo = self._position(cursor["ts"])
+            while lo < len(entries) and entries[lo] is not cursor:
+                lo += 1
+            start = lo + 1
+        return entries[start:start + limit] if limit else entries[start:]
+
+    def record(self, op, eid):
+        """Änderung in den Feed schreiben und wartende Long-Polls wecken. Nur mit self.lock."""
+        self.version += 1
+        self.log.append({"v": self.version, "op": op, "id": eid})
+        self.changed.notify_all()
+
+    def changes_since(self, since, wait=0):
+        """Änderungen nach Version `since`; blockiert bis zu `wait` Sekunden, falls keine.
+
+        `reset` ist True, wenn `since` nicht mehr (oder noch nie) im Log liegt –
+        der Client muss dann die komplette Liste neu laden.
+        """
+        with self.lock:
+            if since == self.version and wait > 0:
+                self.changed.wait_for(lambda: self.version != since, timeout=wait)
+            oldest = self.log[0]["v"] - 1 if self.log else self.version
+            if since < oldest or since > self.version:
+                return {"version": self.version, "reset": True, "changes": []}
+            changes = [c for c in self.log if c["v"] > since]
+            return {"version": self.version, "reset": False, "changes": changes}
+
+    # Live-Einträge
+
+    def live_start(self, label):
+        """Live-Eintrag anlegen – None, wenn schon LIVE_STREAMS laufen."""
+        with self.lock:
+            if len(self.live) >= self.LIVE_STREAMS:
+                return None
+            stream = LiveStream(new_id(), label, LIVE_BUFFER)
+            self.live[stream.id] = stream
+            self.record("live", stream.id)
+            return stream
+
+    def live_end(self, stream):
+        """Erzeuger fertig: Puffer als normalen Eintrag ablegen, erst danach die
+        Leser beenden. Die ID bleibt (Leser und UI kennen sie), der Zeitstempel
+        ist das Ende – sonst sortiert sich ein langer Stream weit unten ein.
+
+        → (Eintrag oder None, wenn nichts kam; ob er gespeichert wurde).
+        """
+        content = stream.text().strip()
+        entry = new_entry(content, label=stream.label, eid=stream.id) if content else None
+        added = False
+        if entry:
+            entry["ts"] = int(time.time() * 1000)
+            added = self.add(entry)
+        with self.lock:
+            del self.live[stream.id]
+            self.record("live", stream.id)
+        stream.close()
+        return entry, added
+
+    # Replikation
+
+    def replicate_since(self, since, wait=0):
+        """Change-Feed für Peers: Pushes mit Metadaten (ohne Inhalt, mit hash).
+
+        Ist `since` unbekannt, kommt statt der Änderungen ein vollständiger
+        Schnappschuss aller Einträge plus Tombstones.
+        """
+        feed = self.changes_since(since, wait)
+        if feed["reset"]:
+            with self.lock:
+                return {"version": self.version, "reset": True,
+                        "entries": [replication_meta(e) for e in self.entries],
+                        "tombstones": list(self.tombstones)}
+        changes = []
+        for c in feed["changes"]:
+            e = self.index.get(c["id"]) if c["op"] == "push" else None
+            changes.append(dict(c, entry=replication_meta(e)) if e else c)
+        feed["changes"] = changes
+        return feed
+
+    def has_hash(self, h):
+        return h in self.by_hash
+
+    def entry_by_hash(self, h):
+        ids = self.by_hash.get(h)
+        return self.index.get(next(iter(ids), None)) if ids else None
+
+    def content_by_hash(self, h):
+        e = self.entry_by_hash(h)
+        try:
+            return self.content(e) if e else None
+        except OSError:
+            return None   # Blob gerade mit dem letzten Eintrag gelöscht
+
+    def set_peer_cursor(self, url, version):
+        with self.peers_lock:
+            self.peer_cursors[url] = version
+            self._write_json(self.peers_file, self.peer_cursors)
+
+CHANNEL_NAME = re.compile(r"^[a-z0-9_-]{1,32}$")
+
+def parse_channels(spec):
+    """CLIPSYNC_CHANNELS → {name: Channel}, immer inklusive "default"."""
+    base = os.path.dirname(os.path.abspath(DATA_FILE))
+    channels = {"default": Channel("default", TOKEN, MAX_ENTRIES, DATA_FILE)}
+    for item in filter(None, (x.strip() for x in spec.split(","))):
+        name, _, rest = item.partition("=")
+        name = name.strip().lower()
+        token, _, limit = rest.rpartition(":")
+        if not limit.isdigit():
+            token, limit = rest, ""
+        if not CHANNEL_NAME.match(name) or name in channels:
+            print(f"  ✗ Ungültiger oder doppelter Kanal ignoriert: {name!r}")
+            continue
+        channels[name] = Channel(name, token, int(limit) if limit else MAX_ENTRIES,
+                                 os.path.join(base, f"clipsync_data.{name}.json"))
+    return channels
+
+CHANNELS = parse_channels(CHANNELS_SPEC)
+DEFAULT_CHANNEL = CHANNELS["default"]
 
 def detect_type(content):
     c = content.strip()
@@ -131,18 +1013,571 @@ def detect_type(content):
         return "code"
     return "text"
 
-def new_entry(content, label="", entry_type=None, filename=None):
-    import random, string
-    eid = ''.join(random.choices(string.ascii_lowercase + string.digits, k=8))
+class IdGenerator:
+    """ULID-artige IDs: 48 Bit Millisekunden + 80 Bit Zufall, Crockford-Base32.
+
+    26 Zeichen, lexikografisch = zeitlich sortiert. Innerhalb derselben
+    Millisekunde wird der Zufallsteil hochgezählt (monoton), damit IDs
+    eines Prozesses garantiert eindeutig bleiben.
+    """
+
+    ALPHABET = "0123456789abcdefghjkmnpqrstvwxyz"
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.last_ms = 0
+        self.last_rand = 0
+
+    def __call__(self, ms=None):
+        ms = int(time.time() * 1000) if ms is None else ms
+        with self.lock:
+            if ms <= self.last_ms:
+                ms, rand = self.last_ms, self.last_rand + 1
+                if rand >> 80:
+                    ms, rand = ms + 1, 0
+            else:
+                rand = int.from_bytes(os.urandom(10), "big")
+            self.last_ms, self.last_rand = ms, rand
+        n = (ms << 80) | rand
+        out = []
+        for _ in range(26):
+            out.append(self.ALPHABET[n & 31])
+            n >>= 5
+        return "".join(reversed(out))
+
+    @classmethod
+    def timestamp(cls, eid):
+        """Millisekunden-Zeitstempel aus einer ID (Umkehrung von __call__)."""
+        n = 0
+        for ch in eid[:10]:   # 2 Füllbits + 48 Bit Zeit
+            n = (n << 5) | cls.ALPHABET.index(ch)
+        return n
+
+new_id = IdGenerator()
+
+def new_entry(content, label="", entry_type=None, filename=None, eid=None):
+    eid = eid or new_id()
     return {
         "id": eid,
         "content": content,
         "type": entry_type or detect_type(content),
         "label": label or filename or "",
         "filename": filename or "",
-        "ts": int(time.time() * 1000),
+        "ts": IdGenerator.timestamp(eid),
+        "hash": content_hash(content),
     }
 
+# ── Export / Import ──────────────────────────────────────────────────────────
+
+ENTRY_ID = re.compile(r"^[0-9A-Za-z_-]{1,64}$")
+IMPORT_FIELDS = ("id", "content", "type", "label", "filename", "ts", "hash")
+IMPORT_LINE_MAX = 80 * 1024 * 1024   # ein Eintrag samt JSON-Hülle (Pushes: max. 50 MB)
+
+def _export_record(ch, e):
+    rec = {k: v for k, v in e.items() if k not in ("enc", "size")}
+    if "enc" in e:
+        rec["content"] = ch._read_body(e)   # am Cache vorbei, ein Export soll ihn nicht leeren
+    return rec
+
+def export_ndjson(ch, entries, out):
+    """Ein Eintrag pro Zeile, mit Inhalt – dieselbe Form wie /api/entry/<id>."""
+    for e in entries:
+        out.write(encode_json(_export_record(ch, e)) + b"\n")
+
+def export_tar(ch, entries, out):
+    """Tar-Stream: je Eintrag entries/<id>.json in Dateiform, davor ggf. sein Blob
+    unter blobs/ so wie er auf der Platte liegt – ohne Entpacken/Neupacken.
+    Delta-Einträge kommen mit vollem Inhalt, ihre Basis steht evtl. nicht im Export."""
+    sent = set()
+    with tarfile.open(fileobj=out, mode="w|", format=tarfile.PAX_FORMAT) as tar:
+        for e in entries:
+            mtime = e["ts"] // 1000
+            if e.get("enc") == "delta":
+                data = encode_json(_export_record(ch, e))
+            else:
+                if "enc" in e and e["hash"] not in sent:
+                    path = ch.blob_path(e)
+                    with open(path, "rb") as f:
+                        info = tarfile.TarInfo("blobs/" + os.path.basename(path))
+                        info.size, info.mtime = os.fstat(f.fileno()).st_size, mtime
+                        tar.addfile(info, f)
+                    sent.add(e["hash"])
+                data = encode_json(e)
+            info = tarfile.TarInfo(f"entries/{e['id']}.json")
+            info.size, info.mtime = len(data), mtime
+            tar.addfile(info, io.BytesIO(data))
+
+def _ndjson_records(f):
+    while True:
+        line = f.readline(IMPORT_LINE_MAX)
+        if not line:
+            return
+        if not line.endswith(b"\n") and len(line) >= IMPORT_LINE_MAX:
+            raise ValueError("Import-Zeile zu lang")
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield None
+
+def _tar_records(f):
+    blobs = {}   # hash → (enc, Bytes); im Export-Stream steht der Blob direkt vor seinen Einträgen
+    with tarfile.open(fileobj=f, mode="r|") as tar:
+        for member in tar:
+            if not member.isfile():
+                continue
+            data = tar.extractfile(member).read()
+            name = member.name
+            if name.startswith("blobs/"):
+                h, ext = os.path.splitext(os.path.basename(name))
+                enc = {v: k for k, v in Channel.BLOB_EXT.items()}.get(ext)
+                if enc and enc != "delta":
+                    blobs = {h: (enc, data)}   # nur den letzten halten → Speicher begrenzt
+            elif name.startswith("entries/") and name.endswith(".json"):
+                try:
+                    rec = json.loads(data)
+                except ValueError:
+                    yield None
+                    continue
+                if isinstance(rec, dict) and "enc" in rec and rec.get("hash") in blobs:
+                    enc, raw = blobs[rec["hash"]]
+                    rec["content"] = decompress_content(enc, raw).decode("utf-8")
+                yield rec
+
+def import_stream(ch, f, batch=200):
+    """Export-Stream (NDJSON oder tar, am ersten Byte erkannt) einlesen.
+
+    Übersprungen wird, was es schon gibt – gleiche ID oder gleicher Inhalt
+    (hash) → duplicate – und was zu alt für das Limit des Kanals ist → skipped.
+    Eingelesen wird zeilen- bzw. dateiweise und in Batches
+    gespeichert, der Speicherbedarf hängt also nicht an der Stream-Größe.
+    """
+    records = _ndjson_records(f) if f.peek(1)[:1] == b"{" else _tar_records(f)
+    stats = {"added": 0, "duplicate": 0, "skipped": 0, "invalid": 0}
+    pending, hashes = [], set()
+
+    def flush():
+        # Neueste zuerst: so verdrängt kein Eintrag einen aus demselben Batch, und
+        # was danach fehlt (ohne Tombstone), war zu alt fürs Limit
+        pending.sort(key=lambda e: e["ts"], reverse=True)
+        added = ch.add_many(pending)
+        old = sum(1 for e in pending if e["id"] not in ch.index and e["id"] not in ch.tombstones)
+        stats["added"] += added
+        stats["skipped"] += min(old, len(pending) - added)
+        stats["duplicate"] += max(len(pending) - added - old, 0)   # inzwischen gepusht/gelöscht
+        pending.clear()
+        hashes.clear()
+
+    for rec in records:
+        if not isinstance(rec, dict) or not isinstance(rec.get("content"), str) \
+                or not ENTRY_ID.match(str(rec.get("id", ""))) or not isinstance(rec.get("ts"), int):
+            stats["invalid"] += 1
+            continue
+        e = {k: rec[k] for k in IMPORT_FIELDS if k in rec}
+        h = content_hash(e["content"])
+        if e.setdefault("hash", h) != h:
+            stats["invalid"] += 1   # Inhalt passt nicht zum Hash
+            continue
+        e.setdefault("type", detect_type(e["content"]))
+        if ch.get(e["id"]) or e["id"] in ch.tombstones or ch.has_hash(h) or h in hashes:
+            stats["duplicate"] += 1
+            continue
+        pending.append(e)
+        hashes.add(h)
+        if len(pending) >= batch:
+            flush()
+    flush()
+    return stats
+
+class ChunkedWriter:
+    """Schreibt eine Antwort unbekannter Länge als Transfer-Encoding: chunked."""
+
+    def __init__(self, wfile, size=64 * 1024):
+        self.wfile = wfile
+        self.size = size
+        self.buf = []
+        self.pending = 0
+
+    def write(self, data):
+        self.buf.append(bytes(data))
+        self.pending += len(data)
+        if self.pending >= self.size:
+            self.flush()
+        return len(data)
+
+    def flush(self):
+        if self.pending:
+            data = b"".join(self.buf)
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            self.buf, self.pending = [], 0
+
+    def close(self):
+        self.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+class LimitedReader(io.RawIOBase):
+    """Liest höchstens `length` Bytes (Request-Body) aus einem Socket-rfile."""
+
+    def __init__(self, f, length):
+        self.f = f
+        self.left = length
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        if self.left <= 0:
+            return 0
+        n = self.f.readinto(memoryview(b)[:min(len(b), self.left)])
+        self.left -= n or 0
+        return n
+
+class ChunkedReader(io.RawIOBase):
+    """Request-Body mit Transfer-Encoding: chunked – liefert Daten, sobald sie da sind."""
+
+    def __init__(self, f):
+        self.f = f
+        self.left = 0   # Rest des aktuellen Chunks
+        self.eof = False
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        if self.eof:
+            return 0
+        if not self.left:
+            line = self.f.readline(1024)
+            if not line:
+                raise ConnectionError("Body vor dem letzten Chunk abgebrochen")
+            self.left = int(line.split(b";", 1)[0], 16)
+            if self.left < 0:
+                raise ValueError("ungültige Chunk-Größe")
+            if not self.left:
+                while self.f.readline(1024).strip():   # Trailer überspringen
+                    pass
+                self.eof = True
+                return 0
+        n = self.f.readinto1(memoryview(b)[:min(len(b), self.left)])
+        if not n:
+            raise ConnectionError("Body mitten im Chunk abgebrochen")
+        self.left -= n
+        if not self.left and self.f.readline(3).strip():
+            raise ValueError("Chunk ohne CRLF")
+        return n
+
+# ── Replikation ──────────────────────────────────────────────────────────────
+
+class PeerLink:
+    """Folgt dem Replikations-Feed eines Kanals auf einem anderen ClipSync-Server.
+
+    Pushes und Deletes werden idempotent über IDs angewendet (Tombstones
+    verhindern Wiederbelebung), Inhalte nur für unbekannte Hashes gebündelt
+    und gzip-komprimiert nachgeladen. Der Cursor liegt auf der Platte – nach
+    Verbindungsabbruch oder Neustart geht es an derselben Stelle weiter.
+    """
+
+    BLOB_BATCH = 64
+    WAIT = 25
+
+    def __init__(self, url, token, channel):
+        self.url = url.rstrip("/")
+        u = urlsplit(self.url)
+        self.netloc = u.netloc
+        self.https = u.scheme == "https"
+        self.channel = channel
+        self.token = token or channel.token
+        self.base = "/api" if channel.name == "default" else f"/api/c/{channel.name}"
+        self.conn = None
+
+    def _connect(self):
+        if self.https:
+            # Peers nutzen in der Regel selbstsignierte Zertifikate (wie die Shell-Snippets)
+            ctx = ssl.create_default_context()
+            ctx.check_hostname = False
+            ctx.verify_mode = ssl.CERT_NONE
+            return http.client.HTTPSConnection(self.netloc, timeout=self.WAIT + 15, context=ctx)
+        return http.client.HTTPConnection(self.netloc, timeout=self.WAIT + 15)
+
+    def get(self, path):
+        headers = {"Accept-Encoding": "gzip"}
+        if self.token:
+            headers["X-Token"] = self.token
+        if self.conn is None:
+            self.conn = self._connect()
+        try:
+            self.conn.request("GET", self.base + path, headers=headers)
+            resp = self.conn.getresponse()
+            data = resp.read()
+        except Exception:
+            self.conn.close()
+            self.conn = None
+            raise
+        if resp.will_close:
+            self.conn.close()
+            self.conn = None
+        if resp.getheader("Content-Encoding") == "gzip":
+            data = zlib.decompress(data, 47)
+        if resp.status != 200:
+            raise ConnectionError(f"HTTP {resp.status}: {data[:100].decode('utf-8', 'replace')}")
+        return json.loads(data)
+
+    def sync_once(self):
+        ch = self.channel
+        since = ch.peer_cursors.get(self.url, 0)
+        feed = self.get(f"/replicate?since={since}&wait={self.WAIT}")
+        if feed["reset"]:
+            metas, deletes = feed["entries"], feed["tombstones"]
+        else:
+            metas = [c["entry"] for c in feed["changes"] if c["op"] == "push" and "entry" in c]
+            deletes = [c["id"] for c in feed["changes"] if c["op"] == "delete"]
+        # Deletes zuerst: ein im selben Batch gepushter und gelöschter Eintrag bleibt gelöscht
+        removed = ch.remove_many(deletes, remote=True)
+        added = self.apply(metas)
+        ch.set_peer_cursor(self.url, feed["version"])
+        if added or removed:
+            print(f"  ⇄ {self.url} [{ch.name}]: +{added} −{removed}")
+
+    def apply(self, metas):
+        ch = self.channel
+        metas = [m for m in metas if m["id"] not in ch.index and m["id"] not in ch.tombstones]
+        missing = sorted({m["hash"] for m in metas if not ch.has_hash(m["hash"])})
+        blobs = {}
+        for i in range(0, len(missing), self.BLOB_BATCH):
+            batch = missing[i:i + self.BLOB_BATCH]
+            blobs.update(self.get("/blobs?h=" + ",".join(batch))["blobs"])
+        added = 0
+        for m in metas:
+            content = blobs.get(m["hash"])
+            if content is None:
+                content = ch.content_by_hash(m["hash"])
+            if content is None or content_hash(content) != m["hash"]:
+                continue   # Peer hat den Inhalt nicht mehr (oder er ist beschädigt)
+            added += ch.add(dict(m, content=content))
+        return added
+
+    def run(self):
+        delay = 1
+        while True:
+            try:
+                self.sync_once()
+                delay = 1
+            except Exception as e:
+                if delay == 1:
+                    print(f"  ✗ Peer {self.url} [{self.channel.name}]: {e}")
+                time.sleep(delay)
+                delay = min(delay * 2, 30)
+
+    def start(self):
+        threading.Thread(target=self.run, name=f"peer-{self.netloc}-{self.channel.name}",
+                         daemon=True).start()
+
+def parse_peers(spec):
+    """CLIPSYNC_PEERS → [(url, token)]; der Token hängt optional mit # an der URL."""
+    peers = []
+    for item in filter(None, (x.strip() for x in spec.split(","))):
+        url, _, token = item.partition("#")
+        peers.append((url, token))
+    return peers
+
+# ── Rate limiting / Admission control ────────────────────────────────────────
+
+class RateLimiter:
+    """Token-Buckets pro Schlüssel (z.B. ("push", "ip:1.2.3.4")).
+
+    Jeder Bucket fasst eine Minute an Kontingent (Burst) und füllt sich
+    kontinuierlich mit `rate_per_min / 60` pro Sekunde wieder auf.
+    """
+
+    MAX_BUCKETS = 4096
+
+    def __init__(self):
+        self.buckets = {}   # key -> [tokens, last_refill]
+        self.lock = threading.Lock()
+
+    def take(self, costs):
+        """costs: Liste von (key, rate_per_min, cost).
+
+        Zieht alle Kosten atomar ab und gibt 0 zurück – oder, falls ein
+        Bucket nicht reicht, die Wartezeit in Sekunden (nichts wird abgezogen).
+        """
+        now = time.monotonic()
+        with self.lock:
+            if len(self.buckets) > self.MAX_BUCKETS:
+                self._prune(now)
+            wait = 0.0
+            states = []
+            for key, rate, cost in costs:
+                if rate <= 0:
+                    continue
+                per_sec = rate / 60.0
+                tokens, last = self.buckets.get(key, (rate, now))
+                tokens = min(rate, tokens + (now - last) * per_sec)
+                # Einzelne Requests größer als der Burst dürfen bei vollem
+                # Bucket passieren (Bucket geht ins Minus) statt ewig zu warten
+                need = min(cost, rate)
+                if tokens < need:
+                    wait = max(wait, (need - tokens) / per_sec)
+                states.append((key, tokens, cost))
+            if wait:
+                return wait
+            for key, tokens, cost in states:
+                self.buckets[key] = [tokens - cost, now]
+            return 0.0
+
+    def _prune(self, now):
+        # Buckets, die längst wieder voll wären, tragen keine Information mehr
+        stale = [k for k, (_, last) in self.buckets.items() if now - last > 120]
+        for k in stale:
+            del self.buckets[k]
+
+LIMITER  = RateLimiter()
+INFLIGHT = threading.BoundedSemaphore(MAX_INFLIGHT) if MAX_INFLIGHT > 0 else None
+
+# ── Debug / Profiling ────────────────────────────────────────────────────────
+
+class Timing:
+    """Phasen-Zeiten eines Requests: lap(phase) bucht die Zeit seit dem
+    vorigen lap() auf `phase` (read_body, parse, store, serialize, write)."""
+
+    __slots__ = ("start", "last", "phases", "status", "parked")
+
+    def __init__(self):
+        self.start = self.last = time.perf_counter()
+        self.phases = {}
+        self.status = None
+        self.parked = False   # Long-Poll/Live – wartet absichtlich, zählt nicht als langsam
+
+    def lap(self, phase):
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self.last
+        self.last = now
+
+class SlowLog:
+    """Ringpuffer der letzten Requests ab MIN_MS, für /debug/slow."""
+
+    MIN_MS = 10
+
+    def __init__(self, size=200):
+        self.items = collections.deque(maxlen=size)
+
+    def add(self, method, path, timing):
+        timing.lap("other")   # Rest: Routing, Auth, Rate-Limit …
+        ms = (timing.last - timing.start) * 1000
+        if timing.parked or ms < self.MIN_MS:
+            return
+        self.items.append({"ts": int(time.time() * 1000), "method": method, "path": path,
+                           "status": timing.status, "ms": round(ms, 2),
+                           "phases": {k: round(v * 1000, 2) for k, v in timing.phases.items()}})
+
+    def slowest(self, limit=50):
+        return sorted(list(self.items), key=lambda r: r["ms"], reverse=True)[:limit]
+
+class StackSampler:
+    """Sampling-Profiler über sys._current_frames(): kein Tracing, die Threads
+    merken nichts davon. Ergebnis im Collapsed-Stack-Format (flamegraph.pl,
+    speedscope): "äußerster;…;innerster Frame Anzahl" je Zeile."""
+
+    def __init__(self):
+        self.lock = threading.Lock()   # ein Profil zur Zeit
+
+    def sample(self, seconds, hz=100, all_threads=False):
+        """→ (Counter Stack → Anzahl, Anzahl Samples) oder None, wenn schon eins läuft."""
+        if not self.lock.acquire(blocking=False):
+            return None
+        try:
+            me = threading.get_ident()
+            labels = {}   # Code-Objekt → "func (datei:zeile)"
+            counts = collections.Counter()
+            samples = 0
+            deadline = time.monotonic() + seconds
+            while time.monotonic() < deadline:
+                for tid, frame in sys._current_frames().items():
+                    if tid == me:
+                        continue
+                    stack, request = [], False
+                    while frame is not None:
+                        co = frame.f_code
+                        label = labels.get(co)
+                        if label is None:
+                            label = labels[co] = f"{co.co_name} ({os.path.basename(co.co_filename)}:{co.co_firstlineno})"
+                        stack.append(label)
+                        request = request or co.co_name == "process_request_thread"
+                        frame = frame.f_back
+                    if request or all_threads:
+                        counts[";".join(reversed(stack))] += 1
+                samples += 1
+                time.sleep(1 / hz)
+            return counts, samples
+        finally:
+            self.lock.release()
+
+SLOW     = SlowLog() if DEBUG else None
+PROFILER = StackSampler()
+
+class ClipSyncServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    local = False         # Unix-Socket-Listener (siehe ClipSyncUnixServer)
+    tls = None            # TLSConfig, wenn HTTPS aktiv
+    first_request = None  # Sekunden vom Prozessstart bis zum ersten Request
+
+    def finish_request(self, request, client_address):
+        if self.first_request is None:
+            self.first_request = time.perf_counter() - STARTED
+            print(f"  ✓ Erster Request nach {self.first_request * 1000:.0f} ms")
+        if self.tls is None:
+            return super().finish_request(request, client_address)
+        # TLS-Handshake im Worker-Thread statt in accept() – ein langsamer
+        # Client blockiert so nicht die Annahme weiterer Verbindungen
+        try:
+            conn = self.tls.wrap(request)
+        except (ssl.SSLError, OSError):
+            return   # z.B. Browser lehnt selbstsigniertes Zertifikat ab
+        try:
+            super().finish_request(conn, client_address)
+        finally:
+            conn.close()
+
+class ClipSyncUnixServer(ThreadingMixIn, UnixStreamServer):
+    """Derselbe Handler auf einem Unix-Socket: kein TCP, kein TLS, kein Token.
+
+    Wer verbinden darf, regeln die Dateirechte – der Socket gehört dem
+    Server-User und ist nur für ihn les-/schreibbar (0600).
+    """
+
+    daemon_threads = True
+    local = True
+    bound = False   # nur den eigenen Socket wieder löschen, nie den eines anderen Servers
+
+    def server_bind(self):
+        path = self.server_address
+        if os.path.lexists(path):
+            st = os.lstat(path)
+            if not stat.S_ISSOCK(st.st_mode) or st.st_uid != os.getuid():
+                raise OSError(f"{path}: kein eigener Socket")
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(path)
+                raise OSError(f"{path}: hier läuft schon ein Server")
+            except (ConnectionRefusedError, FileNotFoundError):
+                os.unlink(path)   # Überbleibsel eines abgestürzten Servers
+            finally:
+                probe.close()
+        old = os.umask(0o177)   # schon beim Anlegen 0600, kein Zeitfenster bis chmod
+        try:
+            super().server_bind()
+        finally:
+            os.umask(old)
+        self.bound = True
+
+    def server_close(self):
+        super().server_close()
+        if self.bound:
+            try:
+                os.unlink(self.server_address)
+            except OSError:
+                pass
+
 # ── Embedded HTML UI ──────────────────────────────────────────────────────────
 
 HTML = r"""<!DOCTYPE html>
@@ -200,9 +1635,10 @@ HTML = r"""<!DOCTYPE html>
   .filter-btn:hover:not(.active) { color: var(--text2); }
 
   /* Entry list */
-  #list { flex: 1; overflow-y: auto; }
+  #list { flex: 1; overflow-y: auto; position: relative; }
+  #list-rows { position: relative; }
   #list::-webkit-scrollbar { width: 4px; } #list::-webkit-scrollbar-track { background: transparent; } #list::-webkit-scrollbar-thumb { background: var(--border2); }
-  .entry { padding: 10px 14px; border-bottom: 1px solid var(--border); cursor: pointer; border-left: 3px solid transparent; transition: background .1s; }
+  .entry { position: absolute; top: 0; left: 0; right: 0; height: 64px; overflow: hidden; padding: 10px 14px; border-bottom: 1px solid var(--border); cursor: pointer; border-left: 3px solid transparent; transition: background .1s; }
   .entry:hover { background: var(--bg3); }
   .entry.selected { background: #13131a; border-left-color: var(--accent); }
   .entry-top { display: flex; align-items: center; gap: 8px; margin-bottom: 4px; }
@@ -214,9 +1650,10 @@ HTML = r"""<!DOCTYPE html>
   .type-file { color: #cc88ff; }
   .entry-label { font-size: 11px; color: var(--text2); flex: 1; overflow: hidden; text-overflow: ellipsis; white-space: nowrap; }
   .entry-time { font-size: 10px; color: var(--text3); white-space: nowrap; }
+  .entry.live .entry-time { color: var(--accent3); }
   .entry-preview { font-size: 11px; color: #999; overflow: hidden; text-overflow: ellipsis; white-space: nowrap; max-width: 100%; }
   .entry-preview.link { color: var(--link-color); }
-  .entry-img-thumb { height: 32px; width: 48px; object-fit: cover; border: 1px solid var(--border2); }
+  .entry-img-thumb { height: 24px; width: 48px; object-fit: cover; border: 1px solid var(--border2); }
   .entry-img-row { display: flex; align-items: center; gap: 8px; }
   #empty { padding: 32px; text-align: center; color: var(--text3); font-size: 12px; line-height: 2; }
 
@@ -292,7 +1729,7 @@ HTML = r"""<!DOCTYPE html>
       <button class="filter-btn" data-f="image" onclick="setFilter('image')">bild</button>
       <button class="filter-btn" data-f="file" onclick="setFilter('file')">datei</button>
     </div>
-    <div id="list"></div>
+    <div id="list"><div id="empty" style="display:none">Noch nichts hier.<br>Füge oben etwas ein.</div><div id="list-rows"></div></div>
   </div>
 
   <div id="right">
@@ -307,7 +1744,7 @@ HTML = r"""<!DOCTYPE html>
         <span id="detail-title">–</span>
         <span id="detail-id" style="font-family:'JetBrains Mono',monospace;"></span>
         <button class="btn" id="copy-btn" onclick="copySelected()">kopieren</button>
-        <button class="btn" id="download-btn" onclick="downloadEntry(entries.find(x=>x.id===selected))" style="display:none" title="Als Datei herunterladen">↓</button>
+        <button class="btn" id="download-btn" onclick="downloadEntry(full.get(selected))" style="display:none" title="Als Datei herunterladen">↓</button>
         <button class="btn" onclick="deleteSelected()" style="color:#744; border-color:#2a1a1a;">✕</button>
       </div>
       <div id="detail-body"></div>
@@ -320,7 +1757,16 @@ HTML = r"""<!DOCTYPE html>
 let entries = [];
 let selected = null;
 let filter = 'all';
-const TOKEN = document.cookie.split(';').map(c => c.trim()).find(c => c.startsWith('cs_token='))?.split('=')[1] || '';
+let version = 0;
+let shown = [];            // entries nach Filter – Grundlage der virtuellen Liste
+const full = new Map();    // id → Eintrag mit content, nur die zuletzt geöffneten
+const FULL_MAX = 50;
+const LIVE_CHARS = 200000; // so viel Text eines Live-Eintrags hält die Detailansicht
+let following = null;      // AbortController des mitgelesenen Live-Eintrags
+const CHANNEL = (location.pathname.match(/^\/c\/([a-z0-9_-]+)/) || [])[1] || '';
+const API = CHANNEL ? `/api/c/${CHANNEL}` : '/api';
+const TOKEN_COOKIE = CHANNEL ? `cs_token_${CHANNEL}` : 'cs_token';
+const TOKEN = document.cookie.split(';').map(c => c.trim()).find(c => c.startsWith(TOKEN_COOKIE + '='))?.split('=')[1] || '';
 
 // ── API ──────────────────────────────────────────────────────────────────────
 async function api(method, path, body) {
@@ -331,15 +1777,68 @@ async function api(method, path, body) {
   return res.json();
 }
 
+// Liste nur als Metadaten (preview statt content) – Inhalte lädt renderDetail bei Bedarf
 async function reload() {
   try {
-    const data = await api('GET', '/api/entries');
-    entries = data.entries;
-    renderList();
-    document.getElementById('status').textContent = `${entries.length} Einträge`;
+    const [data, lv] = await Promise.all([api('GET', `${API}/entries?fields=meta`), api('GET', `${API}/live`)]);
+    entries = withLive(data.entries, lv.live);
+    refresh();
   } catch (e) { notify('Ladefehler: ' + e.message, 'err'); }
 }
 
+// Noch wachsende Einträge (live: true) nach ts zwischen die fertigen sortieren
+function withLive(list, live) {
+  const ids = new Set(list.map(e => e.id));
+  return list.concat(live.filter(l => !ids.has(l.id))).sort((a, b) => b.ts - a.ts);
+}
+
+function refresh() {
+  shown = filter === 'all' ? entries : entries.filter(e => e.type === filter);
+  renderList(true);
+  document.getElementById('status').textContent = `${CHANNEL ? CHANNEL + ' · ' : ''}${entries.length} Einträge`;
+}
+
+// Einzelne Änderungen einpflegen statt alles neu zu laden
+async function applyChanges(changes) {
+  let live = false;
+  for (const c of changes) {
+    const i = entries.findIndex(e => e.id === c.id);
+    if (c.op === 'live') {
+      live = true;   // Live-Eintrag begonnen oder beendet
+    } else if (c.op === 'delete') {
+      if (i >= 0) entries.splice(i, 1);
+      full.delete(c.id);
+      if (selected === c.id) { selected = null; renderDetail(); }
+    } else if (i < 0 || entries[i].live) {
+      let m;
+      try { m = await api('GET', `${API}/entry/${c.id}?fields=meta`); } catch (e) { continue; }  // schon wieder weg
+      const k = entries.findIndex(e => e.id === m.id);
+      if (k >= 0 && !entries[k].live) continue;
+      if (k >= 0) entries.splice(k, 1);   // fertiger Live-Eintrag ersetzt seinen Platzhalter
+      let j = 0;
+      while (j < entries.length && entries[j].ts > m.ts) j++;
+      entries.splice(j, 0, m);
+    }
+  }
+  if (live) {
+    try { entries = withLive(entries.filter(e => !e.live), (await api('GET', `${API}/live`)).live); } catch (e) {}
+  }
+  refresh();
+}
+
+// Change-Feed per Long-Poll: nur das Geänderte nachladen, bei Lücken (reset) alles
+async function watch() {
+  while (true) {
+    try {
+      const ch = await api('GET', `${API}/changes?since=${version}&wait=25`);
+      if (ch.version !== version) {
+        version = ch.version;
+        if (ch.reset || ch.changes.length > 50) await reload(); else await applyChanges(ch.changes);
+      }
+    } catch (e) { await new Promise(r => setTimeout(r, 8000)); }
+  }
+}
+
 // ── Rendering ────────────────────────────────────────────────────────────────
 const TYPE_ICONS = { text:'¶', code:'</>', link:'↗', image:'⬚', file:'⬡' };
 const TYPE_CLASS = { text:'type-text', code:'type-code', link:'type-link', image:'type-image', file:'type-file' };
@@ -352,35 +1851,90 @@ function formatTime(ts) {
   return new Date(ts).toLocaleDateString('de-DE');
 }
 
-function renderList() {
-  const el = document.getElementById('list');
-  const filtered = filter === 'all' ? entries : entries.filter(e => e.type === filter);
-  if (!filtered.length) {
-    el.innerHTML = '<div id="empty">Noch nichts hier.<br>Füge oben etwas ein.</div>';
-    return;
-  }
-  el.innerHTML = filtered.map(e => `
-    <div class="entry ${selected === e.id ? 'selected' : ''}" onclick="selectEntry('${e.id}')">
+// Virtuelle Liste: feste Zeilenhöhe, im DOM nur der sichtbare Ausschnitt.
+// Zeilen sind per id verschlüsselt und werden nur verschoben, nie neu gebaut.
+const ROW_H = 64, OVERSCAN = 8;
+const rows = new Map();    // id → DOM-Zeile
+let scrollPending = false;
+
+function createRow(e) {
+  const row = document.createElement('div');
+  row.className = 'entry' + (selected === e.id ? ' selected' : '') + (e.live ? ' live' : '');
+  row.dataset.id = e.id;
+  row.innerHTML = `
       <div class="entry-top">
         <span class="type-badge ${TYPE_CLASS[e.type]||'type-text'}">${TYPE_ICONS[e.type]||'¶'}</span>
         <span class="entry-label">${esc(e.label||'–')}</span>
-        <span class="entry-time">${formatTime(e.ts)}</span>
+        <span class="entry-time">${e.live ? '● live' : formatTime(e.ts)}</span>
       </div>
-      ${e.type === 'image'
-        ? `<div class="entry-img-row"><img class="entry-img-thumb" src="${e.content}" alt=""><span style="font-size:11px;color:var(--text3)">${esc(e.filename||'bild')}</span></div>`
-        : `<div class="entry-preview ${e.type==='link'?'link':''}">${esc((e.content||'').slice(0,90))}</div>`
-      }
-    </div>`).join('');
+      ${e.type === 'image' && (e.preview||'').startsWith('data:image/')
+        ? `<div class="entry-img-row"><img class="entry-img-thumb" src="${API}/entry/${e.id}/raw" loading="lazy" decoding="async" alt=""><span style="font-size:11px;color:var(--text3)">${esc(e.filename||'bild')}</span></div>`
+        : `<div class="entry-preview ${e.type==='link'?'link':''}">${esc(e.preview||'')}</div>`
+      }`;
+  return row;
+}
+
+function renderList(changed) {
+  const el = document.getElementById('list');
+  const box = document.getElementById('list-rows');
+  document.getElementById('empty').style.display = shown.length ? 'none' : '';
+  box.style.height = (shown.length * ROW_H) + 'px';
+  const first = Math.max(0, Math.floor(el.scrollTop / ROW_H) - OVERSCAN);
+  const last = Math.min(shown.length, Math.ceil((el.scrollTop + el.clientHeight) / ROW_H) + OVERSCAN);
+  const keep = new Set();
+  for (let i = first; i < last; i++) {
+    const e = shown[i];
+    keep.add(e.id);
+    let row = rows.get(e.id);
+    if (row && row.classList.contains('live') !== !!e.live) {   // Live-Eintrag ist fertig
+      row.remove();
+      row = null;
+    }
+    if (!row) {
+      row = createRow(e);
+      rows.set(e.id, row);
+      box.appendChild(row);
+    } else if (changed && !e.live) {
+      row.querySelector('.entry-time').textContent = formatTime(e.ts);
+    }
+    row.style.transform = `translateY(${i * ROW_H}px)`;
+  }
+  for (const [id, row] of rows) {
+    if (!keep.has(id)) { row.remove(); rows.delete(id); }
+  }
+}
+
+function onListScroll() {
+  if (scrollPending) return;
+  scrollPending = true;
+  requestAnimationFrame(() => { scrollPending = false; renderList(false); });
 }
 
 function selectEntry(id) {
+  rows.get(selected)?.classList.remove('selected');
   selected = selected === id ? null : id;
-  renderList();
+  rows.get(selected)?.classList.add('selected');
   renderDetail();
 }
 
-function renderDetail() {
-  const e = entries.find(x => x.id === selected);
+async function loadFull(id) {
+  if (full.has(id)) return full.get(id);
+  const e = await api('GET', `${API}/entry/${id}`);
+  full.set(id, e);
+  if (full.size > FULL_MAX) full.delete(full.keys().next().value);
+  return e;
+}
+
+async function renderDetail() {
+  const id = selected;
+  following?.abort();
+  const lv = entries.find(x => x.id === id && x.live);
+  if (lv) { followLive(lv); return; }
+  let e = null;
+  if (id) {
+    try { e = await loadFull(id); } catch (err) { notify('Ladefehler: ' + err.message, 'err'); }
+    if (id !== selected) return;   // inzwischen etwas anderes gewählt
+  }
   document.getElementById('no-select').style.display = e ? 'none' : 'flex';
   const dv = document.getElementById('detail-view');
   dv.style.display = e ? 'flex' : 'none';
@@ -415,6 +1969,44 @@ function renderDetail() {
   body.innerHTML = html;
 }
 
+// Live-Eintrag mitlesen, bis der Erzeuger fertig ist – danach als normalen Eintrag zeigen
+async function followLive(e) {
+  const ctl = following = new AbortController();
+  document.getElementById('no-select').style.display = 'none';
+  document.getElementById('detail-view').style.display = 'flex';
+  document.getElementById('detail-type').textContent = 'live';
+  document.getElementById('detail-title').textContent = e.label || 'kein Label';
+  document.getElementById('detail-id').textContent = '#' + e.id;
+  document.getElementById('copy-btn').textContent = updateCopyBtn(null);
+  document.getElementById('download-btn').style.display = 'none';
+  const body = document.getElementById('detail-body');
+  body.innerHTML = `<div class="detail-text"></div>
+  <div class="detail-meta"><span style="color:var(--accent3)">● live</span><span>ID: <code style="color:var(--text2)">${e.id}</code></span></div>`;
+  const out = body.querySelector('.detail-text');
+  let text = '', painted = true;
+  const paint = () => {   // höchstens ein Neuzeichnen pro Frame, egal wie schnell Daten kommen
+    painted = true;
+    const bottom = body.scrollTop + body.clientHeight >= body.scrollHeight - 20;
+    out.textContent = text;
+    if (bottom) body.scrollTop = body.scrollHeight;
+  };
+  try {
+    const res = await fetch(`${API}/live/${e.id}`, { headers: TOKEN ? { 'X-Token': TOKEN } : {}, signal: ctl.signal });
+    const reader = res.body.pipeThrough(new TextDecoderStream()).getReader();
+    while (true) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      text = (text + value).slice(-LIVE_CHARS);
+      if (painted) { painted = false; requestAnimationFrame(paint); }
+    }
+  } catch (err) {
+    if (ctl.signal.aborted) return;
+  }
+  if (ctl.signal.aborted) return;
+  await reload();   // der Eintrag liegt jetzt fertig in der Liste
+  if (selected === e.id) renderDetail();
+}
+
 function esc(s) {
   return String(s).replace(/&/g,'&amp;').replace(/</g,'&lt;').replace(/>/g,'&gt;').replace(/"/g,'&quot;');
 }
@@ -425,7 +2017,7 @@ async function pushEntry(content, label, type, filename) {
   const l = label ?? document.getElementById('label-input').value.trim();
   if (!c) { notify('Nichts eingegeben', 'err'); return; }
   try {
-    await api('POST', '/api/push', { content: c, label: l, type, filename });
+    await api('POST', `${API}/push`, { content: c, label: l, type, filename });
     document.getElementById('content-input').value = '';
     document.getElementById('label-input').value = '';
     notify('Gespeichert ✓');
@@ -437,7 +2029,7 @@ async function pushEntry(content, label, type, filename) {
 async function deleteSelected() {
   if (!selected) return;
   try {
-    await api('DELETE', `/api/entry/${selected}`);
+    await api('DELETE', `${API}/entry/${selected}`);
     selected = null;
     notify('Gelöscht');
     await reload();
@@ -446,7 +2038,7 @@ async function deleteSelected() {
 }
 
 async function copySelected() {
-  const e = entries.find(x => x.id === selected);
+  const e = full.get(selected);
   if (!e) return;
   const btn = document.getElementById('copy-btn');
 
@@ -520,7 +2112,8 @@ function downloadEntry(e) {
 function setFilter(f) {
   filter = f;
   document.querySelectorAll('.filter-btn').forEach(b => b.classList.toggle('active', b.dataset.f === f));
-  renderList();
+  document.getElementById('list').scrollTop = 0;
+  refresh();
 }
 
 // ── File / Image handling ────────────────────────────────────────────────────
@@ -596,7 +2189,7 @@ function checkToken() {
   const params = new URLSearchParams(location.search);
   const t = params.get('token');
   if (t) {
-    document.cookie = `cs_token=${t}; path=/; max-age=31536000`;
+    document.cookie = `${TOKEN_COOKIE}=${t}; path=/; max-age=31536000; samesite=strict`;
     location.replace(location.pathname);
     return true;
   }
@@ -610,10 +2203,40 @@ function toggleTerminal() {
     const host = location.host;
     const proto = location.protocol;
     const tokenLine = TOKEN ? `\n  CLIPSYNC_TOKEN="${TOKEN}"` : '';
+    const channelLine = CHANNEL ? `\n  CLIPSYNC_CHANNEL="${CHANNEL}"` : '';
+    // Gemeinsamer Python-Teil: auf dem Server-Rechner selbst über den Unix-Socket statt TCP+TLS
+    const pyLocal = `run = os.environ.get('XDG_RUNTIME_DIR')
+where = urllib.parse.urlsplit(host)
+sock = os.environ.get('CLIPSYNC_SOCKET') or (run and os.path.join(run, 'clipsync-%d.sock' % (where.port or (443 if where.scheme == 'https' else 80))))
+def own_socket(p):
+    try:
+        st = os.stat(p)
+    except (OSError, TypeError):
+        return False
+    return stat.S_ISSOCK(st.st_mode) and st.st_uid == os.getuid()
+def is_local(h):
+    try:
+        s = socket.socket(socket.AF_INET6 if ':' in h else socket.AF_INET); s.bind((h, 0)); s.close()
+        return True
+    except OSError:
+        return False
+def urlopen(req):
+    if own_socket(sock) and is_local(where.hostname or ''):
+        try:
+            c = http.client.HTTPConnection('localhost')
+            c.sock = socket.socket(socket.AF_UNIX); c.sock.connect(sock)
+        except OSError:
+            return urllib.request.urlopen(req, context=ctx)
+        c.request(req.get_method(), req.selector, req.data, dict(req.header_items()))
+        r = c.getresponse()
+        if r.status >= 400:
+            raise urllib.error.HTTPError(req.full_url, r.status, r.reason, r.headers, r)
+        return r
+    return urllib.request.urlopen(req, context=ctx)`;
     document.getElementById('term-content').innerHTML = `
 <p style="color:var(--accent);margin-bottom:12px;">Füge folgendes in deine <code>~/.bashrc</code> ein:</p>
 <pre style="background:var(--bg);border:1px solid var(--border);padding:14px;overflow-x:auto;font-size:11px;color:var(--code-color);line-height:1.7;"># ── ClipSync ───────────────────────────────────────────────
-CLIPSYNC_HOST="${proto}//${host}"${tokenLine}
+CLIPSYNC_HOST="${proto}//${host}"${tokenLine}${channelLine}
 
 # ── pbpush: Text, Pipe oder Datei pushen ──────────────────
 # pbpush "text"              → Text
@@ -622,22 +2245,36 @@ CLIPSYNC_HOST="${proto}//${host}"${tokenLine}
 # pbpush bild.png            → Bild (als dataURL)
 # pbpush archiv.zip          → Binärdatei (Base64)
 # pbpush archiv.zip "label"  → mit Label
+# tail -f log | pbpush -f    → live: wächst mit, bis die Pipe endet (Strg+C)
 pbpush() {
-  python3 - "${'{'}{1:-}" "${'{'}{2:-}" "${'{'}{CLIPSYNC_HOST:-}" "${'{'}{CLIPSYNC_TOKEN:-}" << 'PYEOF'
-import sys, os, json, mimetypes, base64, urllib.request, ssl
+  python3 - "${'{'}{1:-}" "${'{'}{2:-}" "${'{'}{CLIPSYNC_HOST:-}" "${'{'}{CLIPSYNC_TOKEN:-}" "${'{'}{CLIPSYNC_CHANNEL:-}" << 'PYEOF'
+import sys, os, json, mimetypes, base64, urllib.request, ssl, socket, stat, http.client
 
-arg, label, host, token = sys.argv[1], sys.argv[2], sys.argv[3], sys.argv[4]
+arg, label, host, token, channel = sys.argv[1], sys.argv[2], sys.argv[3], sys.argv[4], sys.argv[5]
+api = host + (f'/api/c/{channel}' if channel else '/api')
 ctx = ssl.create_default_context()
 ctx.check_hostname = False; ctx.verify_mode = ssl.CERT_NONE
+${pyLocal}
 
 def push(payload):
     data = json.dumps(payload).encode('utf-8')
-    req = urllib.request.Request(host + '/api/push', data=data,
+    req = urllib.request.Request(api + '/push', data=data,
           headers={'Content-Type': 'application/json', 'X-Token': token})
-    resp = json.loads(urllib.request.urlopen(req, context=ctx).read())
+    resp = json.loads(urlopen(req).read())
     print(f"OK  id={resp.get('id','?')}  type={resp.get('type','?')}")
 
-if arg and os.path.isfile(arg):
+def live_chunks():
+    try:
+        yield from iter(lambda: os.read(0, 65536), b'')
+    except KeyboardInterrupt:
+        pass   # Strg+C beendet nur den Live-Eintrag
+
+if arg == '-f':
+    req = urllib.request.Request(api + '/live?label=' + urllib.parse.quote(label), data=live_chunks(),
+          headers={'Content-Type': 'text/plain; charset=utf-8', 'X-Token': token})
+    resp = json.loads(urlopen(req).read())
+    print(f"OK  id={resp.get('id','?')}  type={resp.get('type','?')}  live={resp.get('size',0):,} Bytes")
+elif arg and os.path.isfile(arg):
     filename = os.path.basename(arg)
     mime, _ = mimetypes.guess_type(filename)
     mime = mime or 'application/octet-stream'
@@ -671,18 +2308,33 @@ PYEOF
 # pbpull -o ./ordner/      → in Ordner mit Originalname
 # pbpull <id>              → bestimmten Eintrag auf stdout
 # pbpull <id> -o [pfad]    → bestimmten Eintrag als Datei
+# pbpull -f [id]           → Live-Eintrag mitlesen (ohne id: den neuesten)
 pbpull() {
-  python3 - "${'{'}{1:-}" "${'{'}{2:-}" "${'{'}{3:-}" "${'{'}{CLIPSYNC_HOST:-}" "${'{'}{CLIPSYNC_TOKEN:-}" << 'PYEOF'
-import sys, os, json, base64, urllib.request, ssl
+  python3 - "${'{'}{1:-}" "${'{'}{2:-}" "${'{'}{3:-}" "${'{'}{CLIPSYNC_HOST:-}" "${'{'}{CLIPSYNC_TOKEN:-}" "${'{'}{CLIPSYNC_CHANNEL:-}" << 'PYEOF'
+import sys, os, json, base64, urllib.request, ssl, socket, stat, http.client
 
-a1, a2, a3, host, token = sys.argv[1], sys.argv[2], sys.argv[3], sys.argv[4], sys.argv[5]
+a1, a2, a3, host, token, channel = sys.argv[1], sys.argv[2], sys.argv[3], sys.argv[4], sys.argv[5], sys.argv[6]
+api = host + (f'/api/c/{channel}' if channel else '/api')
 ctx = ssl.create_default_context()
 ctx.check_hostname = False; ctx.verify_mode = ssl.CERT_NONE
+${pyLocal}
 
 def fetch(path):
-    req = urllib.request.Request(host + path,
+    req = urllib.request.Request(api + path,
           headers={'X-Token': token} if token else {})
-    return json.loads(urllib.request.urlopen(req, context=ctx).read())
+    return json.loads(urlopen(req).read())
+
+if a1 == '-f':
+    entry_id = a2 or next((l['id'] for l in fetch('/live')['live']), None)
+    if not entry_id:
+        print("Kein Live-Eintrag", file=sys.stderr); sys.exit(1)
+    r = urlopen(urllib.request.Request(api + f'/live/{entry_id}', headers={'X-Token': token} if token else {}))
+    try:
+        for chunk in iter(lambda: r.read1(65536), b''):
+            sys.stdout.buffer.write(chunk); sys.stdout.buffer.flush()
+    except KeyboardInterrupt:
+        pass
+    sys.exit(0)
 
 # Argumente parsen
 entry_id = None
@@ -694,7 +2346,7 @@ elif a1 and not a1.startswith('-'):
     if a2 == '-o':
         outpath = a3 if a3 else '.'
 
-e        = fetch(f'/api/entry/{entry_id}' if entry_id else '/api/latest')
+e        = fetch(f'/entry/{entry_id}' if entry_id else '/latest')
 content  = e.get('content', '')
 filename = e.get('filename') or e.get('label') or 'clipsync_download'
 is_bin   = content.startswith('data:') and ';base64,' in content
@@ -733,27 +2385,31 @@ pblast() {
 
 # ── pblist: Übersicht aller Einträge ──────────────────────
 pblist() {
-  python3 - "${'{'}{CLIPSYNC_HOST:-}" "${'{'}{CLIPSYNC_TOKEN:-}" << 'PYEOF'
-import sys, json, urllib.request, ssl, datetime
-host, token = sys.argv[1], sys.argv[2]
+  python3 - "${'{'}{CLIPSYNC_HOST:-}" "${'{'}{CLIPSYNC_TOKEN:-}" "${'{'}{CLIPSYNC_CHANNEL:-}" << 'PYEOF'
+import sys, os, json, urllib.request, ssl, datetime, socket, stat, http.client
+host, token, channel = sys.argv[1], sys.argv[2], sys.argv[3]
+api = host + (f'/api/c/{channel}' if channel else '/api')
 ctx = ssl.create_default_context()
 ctx.check_hostname = False; ctx.verify_mode = ssl.CERT_NONE
-req = urllib.request.Request(host + '/api/entries',
+${pyLocal}
+# Nur Metadaten + Vorschau: der Server muss dafür keinen Inhalt entpacken
+req = urllib.request.Request(api + '/entries?' + urllib.parse.urlencode({'fields': 'meta', 'limit': 30}),
       headers={'X-Token': token} if token else {})
-data = json.loads(urllib.request.urlopen(req, context=ctx).read())
-print(f"{'ID':10}  {'Typ':6}  {'Größe':8}  {'Zeit':14}  Inhalt/Datei")
-print('─' * 70)
-for e in data.get('entries', [])[:30]:
+data = json.loads(urlopen(req).read())
+print(f"{'ID':26}  {'Typ':6}  {'Größe':8}  {'Zeit':14}  Inhalt/Datei")
+print('─' * 86)
+for e in data.get('entries', []):
     t  = e.get('type','?')
-    c  = e.get('content','')
+    c  = e.get('preview','')
+    n  = e.get('size',0)
     fn = e.get('filename','') or e.get('label','')
     ts = datetime.datetime.fromtimestamp(e.get('ts',0)//1000).strftime('%d.%m %H:%M')
-    sz = f"{len(c)//1024}KB" if len(c)>1024 else f"{len(c)}B"
+    sz = f"{n//1024}KB" if n>1024 else f"{n}B"
     if c.startswith('data:') and ';base64,' in c:
         preview = f"[binary] {fn}"
     else:
         preview = (fn+': ' if fn else '') + c[:40].replace('\n',' ')
-    print(f"{e['id']:10}  {t:6}  {sz:8}  {ts}  {preview}")
+    print(f"{e['id']:26}  {t:6}  {sz:8}  {ts}  {preview}")
 PYEOF
 }
 # ─────────────────────────────────────────────────────────</pre>
@@ -762,12 +2418,25 @@ PYEOF
   Dann direkt nutzen:<br>
   <code style="color:var(--accent);">pbpush "hallo welt"</code><br>
   <code style="color:var(--accent);">git log --oneline | pbpush</code><br>
+  <code style="color:var(--accent);">tail -f app.log | pbpush -f</code>   → live, <code>pbpull -f</code> liest mit<br>
   <code style="color:var(--accent);">pbpull</code>   → Text ausgeben<br>
   <code style="color:var(--accent);">pblast</code>   → Text ausgeben + in Clipboard<br>
   <code style="color:var(--accent);">pblist</code>   → alle Einträge anzeigen<br><br>
   <strong style="color:var(--text2);">Kein curl, kein wget</strong> – nur <code>python3</code> (stdlib).
   Funktioniert auch mit selbstsigniertem HTTPS-Zertifikat.
-</p>`;
+</p>
+<p style="color:var(--accent);margin:20px 0 12px;">Schneller (optional): Client-Modul mit offener Verbindung, Cache und Daemon</p>
+<pre style="background:var(--bg);border:1px solid var(--border);padding:14px;overflow-x:auto;font-size:11px;color:var(--code-color);line-height:1.7;"># einmalig herunterladen
+mkdir -p ~/.local/bin
+python3 -c "import ssl, urllib.request as u; open('$HOME/.local/bin/clipsync.py', 'wb').write(u.urlopen('${proto}//${host}/clipsync.py', context=ssl._create_unverified_context()).read())"
+
+# ersetzt pbpush/pbpull/pblist von oben (pblast bleibt)
+pbpush() { python3 ~/.local/bin/clipsync.py push "$@"; }
+pbpull() { python3 ~/.local/bin/clipsync.py pull "$@"; }
+pblist() { python3 ~/.local/bin/clipsync.py list; }
+
+# Daemon im Hintergrund: hält Verbindung + Cache, läuft nur einmal pro User
+(python3 ~/.local/bin/clipsync.py daemon >/dev/null 2>&1 &)</pre>`;
     m.style.display = 'block';
   } else {
     m.style.display = 'none';
@@ -782,8 +2451,11 @@ function updateAuthStatus() {
 // ── Init ──────────────────────────────────────────────────────────────────────
 checkToken();
 updateAuthStatus();
-reload();
-setInterval(reload, 8000);  // auto-refresh alle 8s
+const listEl = document.getElementById('list');
+listEl.addEventListener('scroll', onListScroll, { passive: true });
+listEl.addEventListener('click', ev => { const r = ev.target.closest('.entry'); if (r) selectEntry(r.dataset.id); });
+window.addEventListener('resize', onListScroll);
+watch();  // lädt initial und danach bei jeder Änderung im Kanal
 </script>
 </body>
 </html>
@@ -791,26 +2463,104 @@ setInterval(reload, 8000);  // auto-refresh alle 8s
 
 # ── HTTP Handler ──────────────────────────────────────────────────────────────
 
+class BadRequest(ValueError):
+    """Ungültige Anfrage → 400 mit dieser Meldung (statt 500)."""
+
+def query_num(qs, name, default, lo=None, hi=None, kind=int):
+    """Zahl aus dem Query-String, auf [lo, hi] begrenzt; Unsinn → BadRequest."""
+    raw = qs.get(name, [""])[0]
+    if not raw:
+        return default
+    try:
+        value = kind(raw)
+    except ValueError:
+        raise BadRequest(f"invalid {name}") from None
+    if value != value:   # NaN
+        raise BadRequest(f"invalid {name}")
+    if lo is not None:
+        value = max(value, lo)
+    if hi is not None:
+        value = min(value, hi)
+    return value
+
 class Handler(BaseHTTPRequestHandler):
+    # Keep-Alive: Clients (clipsync.py) halten Verbindung + TLS-Session offen
+    protocol_version = "HTTP/1.1"
+    timeout = 120   # Leerlauf-Verbindungen nach 2 min schließen
+    timing = None   # Timing des laufenden Requests, nur mit CLIPSYNC_DEBUG
+
+    def setup(self):
+        # Header und Body sind getrennte Writes: mit Nagle wartet jeder Request einer
+        # Keep-Alive-Verbindung aufs Delayed-ACK (~40 ms). TCP_NODELAY gibt's nur bei TCP.
+        self.disable_nagle_algorithm = not self.server.local
+        super().setup()
+
     def log_message(self, fmt, *args):
-        # Minimales Logging
-        if args and str(args[1]) not in ('200', '304'):
+        # Minimales Logging: nur Request-Zeilen/Fehlercodes, nicht z.B. den Timeout
+        # einer leerlaufenden Keep-Alive-Verbindung (log_error mit einem Argument)
+        if len(args) >= 2 and str(args[1]) not in ('200', '304'):
             print(f"  {args[0]} {args[1]}")
 
+    def log_request(self, code="-", size="-"):
+        if self.timing:
+            self.timing.status = int(code)
+        super().log_request(code, size)
+
+    ROUTE = re.compile(r"^/(api/)?c/([^/]+)(/.*)?$")
+
+    def route(self):
+        """Setzt self.channel und gibt den kanal-relativen Pfad zurück.
+
+        /c/<kanal>/…      → Web-UI des Kanals
+        /api/c/<kanal>/…  → API des Kanals, intern wie /api/…
+        alles andere      → Kanal "default"
+        """
+        path = urlparse(self.path).path
+        m = self.ROUTE.match(path)
+        if not m:
+            self.channel = DEFAULT_CHANNEL
+            return path
+        self.channel = CHANNELS.get(m.group(2))
+        rest = m.group(3) or "/"
+        return "/api" + rest if m.group(1) else rest
+
     def check_auth(self):
-        if not TOKEN:
+        token = self.channel.token
+        if not token or self.server.local:
             return True
-        return self.headers.get("X-Token") == TOKEN or \
-               self.headers.get("Authorization") == f"Bearer {TOKEN}"
-
-    def send_json(self, code, data):
-        body = json.dumps(data, ensure_ascii=True).encode("utf-8")
+        if self.headers.get("X-Token") == token or \
+           self.headers.get("Authorization") == f"Bearer {token}":
+            return True
+        # <img>-Requests der Web-UI können keinen Header setzen → Token-Cookie, nur lesend
+        if self.command != "GET":
+            return False
+        name = "cs_token" if self.channel is DEFAULT_CHANNEL else f"cs_token_{self.channel.name}"
+        try:
+            cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        except Exception:
+            return False
+        return name in cookie and cookie[name].value == token
+
+    def send_json(self, code, data, headers=None):
+        self.send_json_bytes(code, encode_json(data), headers)
+
+    def send_json_bytes(self, code, body, headers=None, compress=False):
+        if compress and len(body) > 1024 and "gzip" in self.headers.get("Accept-Encoding", ""):
+            z = zlib.compressobj(5, zlib.DEFLATED, 31)
+            body = z.compress(body) + z.flush()
+            headers = dict(headers or {}, **{"Content-Encoding": "gzip", "Vary": "Accept-Encoding"})
+        if self.timing:
+            self.timing.lap("serialize")
         self.send_response(code)
         self.send_header("Content-Type", "application/json; charset=utf-8")
         self.send_header("Content-Length", len(body))
         self.send_header("Access-Control-Allow-Origin", "*")
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
         self.end_headers()
         self.wfile.write(body)
+        if self.timing:
+            self.timing.lap("write")
 
     def send_html(self, html):
         body = html.encode("utf-8")
@@ -820,7 +2570,216 @@ class Handler(BaseHTTPRequestHandler):
         self.end_headers()
         self.wfile.write(body)
 
+    def send_content(self, ch, entry):
+        headers = {"Vary": "Accept-Encoding", "ETag": f'"{entry["hash"]}"'}
+        if entry.get("enc") == "gzip" and "gzip" in self.headers.get("Accept-Encoding", ""):
+            _, body = ch.blob(entry)
+            headers["Content-Encoding"] = "gzip"
+        else:
+            body = ch.content(entry).encode("utf-8")
+        if self.timing:
+            self.timing.lap("serialize")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", len(body))
+        self.send_header("Access-Control-Allow-Origin", "*")
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+        if self.timing:
+            self.timing.lap("write")
+
+    def send_raw(self, ch, entry):
+        """Inhalt als Bytes – dataURLs dekodiert mit ihrem MIME-Typ (Vorschaubilder der UI)."""
+        content = ch.content(entry)
+        ctype = "text/plain; charset=utf-8"
+        m = re.match(r"data:([\w.+-]+/[\w.+-]+)?(;[^,]*)?,", content)
+        if m and m.group(2) and m.group(2).endswith(";base64"):
+            try:
+                body = base64.b64decode(content[m.end():])
+                ctype = m.group(1) or "application/octet-stream"
+            except ValueError:
+                body = content.encode("utf-8")
+        else:
+            body = content.encode("utf-8")
+        if self.timing:
+            self.timing.lap("serialize")
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", len(body))
+        self.send_header("X-Content-Type-Options", "nosniff")
+        self.send_header("Content-Security-Policy", "sandbox")   # z.B. SVG mit Skript
+        # Einträge ändern sich nie – der Browser darf für immer cachen
+        self.send_header("Cache-Control", "private, max-age=31536000, immutable")
+        self.send_header("ETag", f'"{entry["hash"]}"')
+        self.end_headers()
+        self.wfile.write(body)
+        if self.timing:
+            self.timing.lap("write")
+
+    def send_export(self, ch, fmt):
+        """Export als Stream; Schreiber laufen währenddessen ungehindert weiter."""
+        tar = fmt == "tar"
+        chunked = self.request_version != "HTTP/1.0"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-tar" if tar else "application/x-ndjson")
+        self.send_header("Content-Disposition",
+                         f'attachment; filename="clipsync-{ch.name}.{"tar" if tar else "ndjson"}"')
+        if chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+        else:
+            self.close_connection = True
+        self.end_headers()
+        out = ChunkedWriter(self.wfile) if chunked else self.wfile
+        try:
+            with ch.snapshot() as entries:
+                (export_tar if tar else export_ndjson)(ch, entries, out)
+            if chunked:
+                out.close()
+            if self.timing:
+                self.timing.lap("write")   # Export: Lesen, Packen und Senden greifen ineinander
+        except (BrokenPipeError, ConnectionResetError):
+            raise
+        except Exception as e:
+            # Header sind schon raus → ohne End-Chunk abbrechen, der Client merkt das
+            print(f"  ✗ Export abgebrochen: {e}")
+            self.close_connection = True
+
+    def receive_live(self, ch):
+        """POST /api/live?label=…: Body wird beim Eintreffen an einen Live-Eintrag gehängt.
+
+        Meist chunked und ohne absehbares Ende (`tail -f`). Erst wenn der Body
+        fertig ist – oder die Verbindung abreißt –, wird daraus ein normaler Eintrag.
+        """
+        chunked = self.headers.get("Transfer-Encoding", "").lower() == "chunked"
+        length = int(self.headers.get("Content-Length", 0) or 0)
+        if not chunked and not length:
+            self.send_json(411, {"error": "Content-Length or chunked body required"})
+            return
+        stream = ch.live_start(parse_qs(urlparse(self.path).query).get("label", [""])[0])
+        if stream is None:
+            self.send_json(503, {"error": "too many live entries"}, {"Retry-After": "10"})
+            return
+        self.body_read = True
+        self.park()   # läuft so lange wie der Erzeuger
+        body = ChunkedReader(self.rfile) if chunked else LimitedReader(self.rfile, length)
+        sock = self.connection
+        sock.settimeout(None)   # `tail -f` darf beliebig lange schweigen …
+        if not self.server.local:
+            # … eine tote Gegenstelle fällt dafür per TCP-Keepalive nach ~2 min auf
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            for opt, val in (("TCP_KEEPIDLE", 60), ("TCP_KEEPINTVL", 15), ("TCP_KEEPCNT", 4)):
+                if hasattr(socket, opt):
+                    sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, opt), val)
+        broken = False
+        try:
+            while True:
+                data = body.read(64 * 1024)
+                if not data:
+                    break
+                if chunked:
+                    self.throttle(len(data))   # Content-Length hat admit() schon abgerechnet
+                stream.append(data)
+        except (OSError, ValueError):
+            broken = True   # Erzeuger weg oder Body kaputt – das Bisherige bleibt
+        finally:
+            sock.settimeout(self.timeout)
+            entry, added = ch.live_end(stream)
+        if added:
+            print(f"  + [{entry['type']:5}] ● {entry['content'][:60]}")
+        if broken:
+            self.close_connection = True
+        elif entry is None:
+            self.send_json(400, {"error": "content required"})
+        elif not added:
+            self.send_json(409, {"error": "entry not stored"})
+        else:
+            self.send_json(201, {"ok": True, "id": entry["id"], "type": entry["type"],
+                                 "hash": entry["hash"], "size": stream.end})
+
+    def send_live(self, stream, qs):
+        """Live-Eintrag mitlesen: Pufferinhalt (oder ab ?from=<byte>), dann alles
+        Neue, bis der Erzeuger fertig ist.
+
+        Jeder Leser schreibt in seinem eigenen Thread. Wer nicht hinterherkommt,
+        bekommt eine Lücke samt Hinweis im Text, bremst aber nie den Erzeuger.
+        """
+        self.park()
+        since = query_num(qs, "from", None, 0)
+        pos = stream.start if since is None else min(since, stream.end)
+        chunked = self.request_version != "HTTP/1.0"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("X-Content-Type-Options", "nosniff")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        if chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+        else:
+            self.close_connection = True
+        self.end_headers()
+        out = ChunkedWriter(self.wfile) if chunked else self.wfile
+        try:
+            while True:
+                start, data = stream.read(pos, 30)
+                gap, pos = start - pos, start + len(data)
+                if gap > 0:
+                    data = f"\n[… {gap:,} Bytes verpasst …]\n".encode("utf-8") + data
+                if data:
+                    out.write(data)
+                    out.flush()
+                elif stream.done:
+                    break
+            if chunked:
+                out.close()
+        except OSError:
+            self.close_connection = True   # Leser weg oder zu langsam (Sende-Timeout)
+
+    def send_debug(self, path, qs):
+        """/debug/slow und /debug/profile – nur mit CLIPSYNC_DEBUG und nur im Kanal "default"."""
+        if SLOW is None or self.channel is not DEFAULT_CHANNEL:
+            self.send_json(404, {"error": "not found"})
+        elif path == "/debug/slow":
+            # Langsamste der letzten Requests ab SlowLog.MIN_MS, mit Zeiten je Phase (ms)
+            limit = query_num(qs, "limit", 50, 1)
+            self.send_json(200, {"min_ms": SlowLog.MIN_MS, "requests": SLOW.slowest(limit)})
+        elif path == "/debug/profile":
+            # ?seconds=N&hz=H&threads=all → Collapsed Stacks, z.B. für flamegraph.pl oder speedscope
+            seconds = query_num(qs, "seconds", 10, 0.1, 60, float)
+            hz = query_num(qs, "hz", 100, 1, 1000, float)
+            self.park()   # wartet nur, während die anderen Threads arbeiten
+            result = PROFILER.sample(seconds, hz, qs.get("threads", [""])[0] == "all")
+            if result is None:
+                self.send_json(409, {"error": "profile already running"})
+                return
+            counts, samples = result
+            body = "".join(f"{stack} {n}\n" for stack, n in counts.most_common()).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Content-Length", len(body))
+            self.send_header("X-Samples", samples)
+            self.send_header("X-Interval-Ms", round(1000 / hz, 2))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self.send_json(404, {"error": "not found"})
+
+    def send_file(self, path, content_type):
+        try:
+            with open(path, "rb") as f:
+                body = f.read()
+        except OSError:
+            self.send_json(404, {"error": "not found"})
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", len(body))
+        self.end_headers()
+        self.wfile.write(body)
+
     def read_body(self):
+        self.body_read = True
         length = int(self.headers.get("Content-Length", 0))
         if length == 0:
             return {}
@@ -828,54 +2787,227 @@ class Handler(BaseHTTPRequestHandler):
         if length > 50 * 1024 * 1024:
             self.rfile.read(length)  # drain socket
             raise ValueError(f"Request too large: {length} bytes")
+        if self.timing:
+            self.timing.lap("other")
         raw = self.rfile.read(length)
-        return json.loads(raw)
+        if self.timing:
+            self.timing.lap("read_body")
+        body = json.loads(raw)
+        if self.timing:
+            self.timing.lap("parse")
+        return body
 
     def do_OPTIONS(self):
         self.send_response(204)
         self.send_header("Access-Control-Allow-Origin", "*")
         self.send_header("Access-Control-Allow-Methods", "GET, POST, DELETE, OPTIONS")
         self.send_header("Access-Control-Allow-Headers", "Content-Type, X-Token, Authorization")
+        self.send_header("Content-Length", "0")
         self.end_headers()
 
-    def do_GET(self):
+    def request_token(self):
+        auth = self.headers.get("Authorization", "")
+        return self.headers.get("X-Token") or (auth[7:] if auth.startswith("Bearer ") else "")
+
+    def rate_clients(self):
+        ip = "unix" if self.server.local else self.client_address[0]
+        clients = ["ip:" + ip]
+        tok = self.request_token()
+        if tok:
+            clients.append(f"tok:{self.channel.name}:{tok}")
+        return clients
+
+    def admit(self, kind):
+        """Token-Bucket-Prüfung für Push/Read und Upload-Bytes. False → 429 gesendet."""
+        clients = self.rate_clients()
+        rate = RATE_PUSH if kind == "push" else RATE_READ
+        costs = [((kind, c), rate, 1) for c in clients]
+        nbytes = int(self.headers.get("Content-Length", 0) or 0)
+        if nbytes:
+            costs += [(("bytes", c), RATE_BYTES, nbytes) for c in clients]
+        wait = LIMITER.take(costs)
+        if not wait:
+            return True
+        self.close_connection = True   # Body nicht lesen, Verbindung schließen
+        self.send_json(429, {"error": "rate limited", "retry_after": round(wait, 1)},
+                       {"Retry-After": str(int(wait) + 1)})
+        return False
+
+    def throttle(self, nbytes):
+        """Upload-Bytes eines laufenden Bodys abrechnen – bremst den Erzeuger statt 429."""
+        costs = [(("bytes", c), RATE_BYTES, nbytes) for c in self.rate_clients()]
+        wait = LIMITER.take(costs)
+        while wait:
+            time.sleep(min(wait, 5))
+            wait = LIMITER.take(costs)
+
+    def serve(self, kind, inner):
+        """Gemeinsamer Rahmen für alle Methoden: In-Flight-Cap, Rate-Limit, Routing, Fehler → 500."""
+        self.holds_slot = INFLIGHT is not None
+        if self.holds_slot and not INFLIGHT.acquire(blocking=False):
+            self.holds_slot = False
+            self.close_connection = True
+            self.send_json(503, {"error": "server busy"}, {"Retry-After": "1"})
+            return
+        self.timing = Timing() if SLOW else None
         try:
-            self._do_GET_inner()
+            self.route_path = self.route()
+            if self.channel is None:
+                self.send_json(404, {"error": "unknown channel"})
+            elif self.admit(kind):
+                inner()
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True   # Client ist weg (z.B. abgebrochener Long-Poll)
+        except BadRequest as e:
+            self.send_json(400, {"error": str(e)})
         except Exception as e:
-            print(f"  ✗ GET error: {e}")
+            print(f"  ✗ {self.command} error: {e}")
             try:
                 self.send_json(500, {"error": str(e)})
             except:
                 pass
+        finally:
+            if self.timing:
+                SLOW.add(self.command, urlparse(self.path).path, self.timing)
+                self.timing = None
+            self.park()
+            # Ungelesener Request-Body würde sonst als nächster Request geparst
+            if not getattr(self, "body_read", False) and \
+               (self.headers.get("Content-Length", "0") != "0" or "Transfer-Encoding" in self.headers):
+                self.close_connection = True
+            self.body_read = False
+
+    def park(self):
+        """In-Flight-Slot vorzeitig freigeben – für Long-Polls, die nur warten."""
+        if self.timing:
+            self.timing.parked = True
+        if self.holds_slot:
+            self.holds_slot = False
+            INFLIGHT.release()
+
+    def do_GET(self):
+        self.serve("read", self._do_GET_inner)
 
     def _do_GET_inner(self):
-        path = urlparse(self.path).path
+        path = self.route_path
+        ch = self.channel
 
         if path in ("/", "/index.html"):
             self.send_html(HTML)
             return
 
+        if path == "/clipsync.py":
+            # Client-Modul zum Herunterladen (siehe $ hilfe)
+            self.send_file(CLIENT_FILE, "text/x-python; charset=utf-8")
+            return
+
         if not self.check_auth():
             self.send_json(401, {"error": "unauthorized"})
             return
 
+        qs = parse_qs(urlparse(self.path).query)
+        meta = qs.get("fields", [""])[0] == "meta"   # ohne content, mit size
+
         if path == "/api/entries":
-            entries = load()
-            self.send_json(200, {"entries": entries, "count": len(entries)})
+            # Optional: ?limit=N&before=<id> für Cursor-Pagination
+            limit = query_num(qs, "limit", 0, 0)
+            entries = ch.page(qs.get("before", [""])[0], limit)
+            if entries is None:
+                self.send_json(404, {"error": "cursor not found"})
+                return
+            extra = {"count": len(entries)}
+            if limit and len(entries) == limit and entries[-1] is not ch.entries[-1]:
+                extra["next"] = entries[-1]["id"]
+            self.send_json_bytes(200, encode_list(ch.encoded(entries, meta), **extra))
+
+        elif path == "/api/changes":
+            # Long-Poll: ?since=<version>&wait=<sekunden> – antwortet sofort bei Änderungen
+            since = query_num(qs, "since", 0)
+            wait = query_num(qs, "wait", 0, 0, 30, float)
+            if wait:
+                self.park()
+            self.send_json(200, ch.changes_since(since, wait))
+
+        elif path == "/api/replicate":
+            # Feed für PeerLink (siehe CLIPSYNC_PEERS) – wie /api/changes plus Metadaten
+            since = query_num(qs, "since", 0)
+            wait = query_num(qs, "wait", 0, 0, 30, float)
+            if wait:
+                self.park()
+            self.send_json_bytes(200, encode_json(ch.replicate_since(since, wait)), compress=True)
+
+        elif path == "/api/blobs":
+            # Inhalte per Hash, gebündelt: ?h=<hash>,<hash>,…
+            hashes = [h for h in qs.get("h", [""])[0].split(",") if h][:256]
+            blobs = {}
+            for h in hashes:
+                content = ch.content_by_hash(h)
+                if content is not None:
+                    blobs[h] = content
+            self.send_json_bytes(200, encode_json({"blobs": blobs}), compress=True)
+
+        elif path == "/api/latest/content" or (path.startswith("/api/entry/") and path.endswith("/content")):
+            # Roher Inhalt; gzip-Blobs gehen bei Accept-Encoding: gzip unverändert raus
+            entries = ch.entries
+            if path.startswith("/api/latest"):
+                entry = entries[0] if entries else None
+            else:
+                entry = ch.get(path.split("/")[3])
+            if entry:
+                self.send_content(ch, entry)
+            else:
+                self.send_json(404, {"error": "not found"})
+
+        elif path == "/api/live":
+            # Laufende Live-Einträge, neueste zuerst
+            streams = sorted(list(ch.live.values()), key=lambda s: s.ts, reverse=True)
+            self.send_json(200, {"live": [s.meta() for s in streams]})
+
+        elif path.startswith("/api/live/"):
+            # Live-Eintrag mitlesen; ist er schon fertig, kommt einfach der ganze Inhalt
+            eid = path.split("/")[3]
+            stream, entry = ch.live.get(eid), ch.get(eid)
+            if stream:
+                self.send_live(stream, qs)
+            elif entry:
+                self.send_content(ch, entry)
+            else:
+                self.send_json(404, {"error": "not found"})
+
+        elif path.startswith("/debug/"):
+            self.send_debug(path, qs)
+
+        elif path == "/api/export":
+            # Online-Backup: ?format=ndjson (Standard) oder tar (mit Blobs wie gespeichert)
+            fmt = qs.get("format", ["ndjson"])[0] or "ndjson"
+            if fmt not in ("ndjson", "tar"):
+                raise BadRequest("invalid format")
+            self.send_export(ch, fmt)
+
+        elif path == "/api/stats":
+            # Füllstand des Kanals und des (serverweiten) Inhalts-Caches
+            self.send_json(200, {"channel": ch.name, "entries": len(ch.entries),
+                                 "blobs": len(ch.refs), "live": len(ch.live),
+                                 "body_cache": BODIES.stats()})
+
+        elif path.startswith("/api/entry/") and path.endswith("/raw"):
+            entry = ch.get(path.split("/")[3])
+            if entry:
+                self.send_raw(ch, entry)
+            else:
+                self.send_json(404, {"error": "not found"})
 
         elif path == "/api/latest":
-            entries = load()
+            entries = ch.entries
             if entries:
-                self.send_json(200, entries[0])
+                self.send_json_bytes(200, ch.encoded(entries[:1], meta)[0])
             else:
                 self.send_json(404, {"error": "empty"})
 
         elif path.startswith("/api/entry/"):
-            eid = path.split("/")[-1]
-            entries = load()
-            entry = next((e for e in entries if e["id"] == eid), None)
+            entry = ch.get(path.split("/")[-1])
             if entry:
-                self.send_json(200, entry)
+                self.send_json_bytes(200, ch.encoded([entry], meta)[0])
             else:
                 self.send_json(404, {"error": "not found"})
 
@@ -883,27 +3015,38 @@ class Handler(BaseHTTPRequestHandler):
             self.send_json(404, {"error": "not found"})
 
     def do_POST(self):
-        try:
-            self._do_POST_inner()
-        except Exception as e:
-            print(f"  ✗ POST error: {e}")
-            try:
-                self.send_json(500, {"error": str(e)})
-            except:
-                pass
+        self.serve("push", self._do_POST_inner)
 
     def _do_POST_inner(self):
         if not self.check_auth():
             self.send_json(401, {"error": "unauthorized"})
             return
 
-        path = urlparse(self.path).path
+        path = self.route_path
+        ch = self.channel
 
         if path == "/api/push":
             body = self.read_body()
-            content = body.get("content", "")
-            if isinstance(content, str):
-                content = content.strip()
+            delta = None
+            if "delta" in body:
+                # Delta-Push: {"base": <id|hash>, "delta": [...], "hash": <hash des Ergebnisses>}
+                base = ch.get(str(body.get("base", ""))) or ch.entry_by_hash(str(body.get("base", "")))
+                if base is None:
+                    self.send_json(409, {"error": "base unknown"})
+                    return
+                try:
+                    content = apply_delta(ch.content(base), body["delta"])
+                except (ValueError, TypeError):
+                    content = None
+                if content is None or content_hash(content) != body.get("hash"):
+                    self.send_json(409, {"error": "delta mismatch"})
+                    return
+                delta = (base, body["delta"])
+            else:
+                content = body.get("content", "")
+            if isinstance(content, str) and content != content.strip():
+                # Die Delta-Ops bauen den ungekürzten Text – dann komplett speichern
+                content, delta = content.strip(), None
             entry_type = body.get("type")
             # Images have content = dataUrl (data:image/...) which is valid
             if not content:
@@ -915,28 +3058,56 @@ class Handler(BaseHTTPRequestHandler):
                 entry_type=entry_type,
                 filename=body.get("filename"),
             )
-            entries = load()
-            entries.insert(0, entry)
-            save(entries)
-            print(f"  + [{entry['type']:5}] {content[:60]}")
-            self.send_json(201, {"ok": True, "id": entry["id"], "type": entry["type"]})
+            if not ch.add(entry, delta):
+                # z.B. Kanal voll mit Einträgen aus der Zukunft (Peer mit falscher Uhr, Import)
+                self.send_json(409, {"error": "entry not stored"})
+                return
+            if self.timing:
+                self.timing.lap("store")
+            print(f"  + [{entry['type']:5}] {'Δ ' if delta else ''}{content[:60]}")
+            self.send_json(201, {"ok": True, "id": entry["id"], "type": entry["type"], "hash": entry["hash"]})
+
+        elif path == "/api/live":
+            # Body (chunked) wächst als Live-Eintrag, siehe receive_live
+            self.receive_live(ch)
+
+        elif path == "/api/import":
+            # Body: Stream aus /api/export (NDJSON oder tar), wird beim Lesen verarbeitet
+            length = int(self.headers.get("Content-Length", 0) or 0)
+            if not length:
+                self.send_json(411, {"error": "Content-Length required"})
+                return
+            self.body_read = True
+            body = LimitedReader(self.rfile, length)
+            try:
+                stats = import_stream(ch, io.BufferedReader(body, 64 * 1024))
+            finally:
+                if body.left:   # Abbruch mitten im Body → Verbindung nicht weiterverwenden
+                    self.close_connection = True
+            if self.timing:
+                self.timing.lap("store")   # Import: Lesen und Speichern greifen ineinander
+            print(f"  ⇣ Import [{ch.name}]: {stats['added']} neu, {stats['duplicate']} doppelt, "
+                  f"{stats['skipped']} zu alt, {stats['invalid']} ungültig")
+            self.send_json(200, dict(stats, ok=True))
 
         else:
             self.send_json(404, {"error": "not found"})
 
     def do_DELETE(self):
+        self.serve("push", self._do_DELETE_inner)
+
+    def _do_DELETE_inner(self):
         if not self.check_auth():
             self.send_json(401, {"error": "unauthorized"})
             return
 
-        path = urlparse(self.path).path
+        path = self.route_path
+        ch = self.channel
         if path.startswith("/api/entry/"):
-            eid = path.split("/")[-1]
-            entries = load()
-            before = len(entries)
-            entries = [e for e in entries if e["id"] != eid]
-            if len(entries) < before:
-                save(entries)
+            removed = ch.remove(path.split("/")[-1])
+            if self.timing:
+                self.timing.lap("store")
+            if removed:
                 self.send_json(200, {"ok": True})
             else:
                 self.send_json(404, {"error": "not found"})
@@ -946,7 +3117,40 @@ class Handler(BaseHTTPRequestHandler):
 
 # ── Main ────────────────────────────────────────────────────────────────────
 
+def offline(argv):
+    """export/import direkt auf den Datendateien – nur bei gestopptem Server."""
+    usage = ("Verwendung: clipsync_server.py export [--tar] [kanal] > backup\n"
+             "            clipsync_server.py import <backup|-> [kanal]")
+    cmd, args = argv[0], argv[1:]
+    tar = "--tar" in args
+    args = [a for a in args if a != "--tar"]
+    if cmd == "import":
+        if not args:
+            print(usage, file=sys.stderr)
+            return 1
+        src, args = args[0], args[1:]
+    ch = CHANNELS.get(args[0] if args else "default")
+    if ch is None:
+        print(f"Unbekannter Kanal: {args[0]}", file=sys.stderr)
+        return 1
+    if cmd == "export":
+        out = sys.stdout.buffer
+        with ch.snapshot() as entries:
+            (export_tar if tar else export_ndjson)(ch, entries, out)
+        out.flush()
+        print(f"  ⇡ Export [{ch.name}]: {len(entries)} Einträge", file=sys.stderr)
+    else:
+        f = sys.stdin.buffer if src == "-" else open(src, "rb")
+        with f:
+            stats = import_stream(ch, f if hasattr(f, "peek") else io.BufferedReader(f))
+        print(f"  ⇣ Import [{ch.name}]: {stats['added']} neu, {stats['duplicate']} doppelt, "
+              f"{stats['skipped']} zu alt, {stats['invalid']} ungültig", file=sys.stderr)
+    return 0
+
 if __name__ == "__main__":
+    if sys.argv[1:2] in (["export"], ["import"]):
+        sys.exit(offline(sys.argv[1:]))
+
     local_ip = get_local_ip()
 
     # HTTPS ist Standard – nur deaktivieren wenn explizit CLIPSYNC_HTTPS=0
@@ -966,12 +3170,26 @@ if __name__ == "__main__":
 
     proto = "https" if USE_HTTPS else "http"
 
-    server = HTTPServer((HOST, PORT), Handler)
+    server = ClipSyncServer((HOST, PORT), Handler)
     server.socket.settimeout(None)  # no global timeout, handled per-request
     server.timeout = 30             # 30s per request max
 
     if USE_HTTPS:
-        server = wrap_https(server)
+        server.tls = TLSConfig(CERT_FILE, KEY_FILE, TLS13_ONLY)
+        server.tls.watch()
+
+    unix_server = None
+    if SOCKET_PATH != "0" and hasattr(socket, "AF_UNIX"):
+        try:
+            unix_server = ClipSyncUnixServer(SOCKET_PATH, Handler)
+            threading.Thread(target=unix_server.serve_forever, name="unix-socket", daemon=True).start()
+        except OSError as e:
+            print(f"  ✗ Unix-Socket nicht verfügbar: {e}")
+
+    peers = parse_peers(PEERS_SPEC)
+    for url, peer_token in peers:
+        for ch in CHANNELS.values():
+            PeerLink(url, peer_token, ch).start()
 
     pad = lambda s, n: s + " " * max(0, n - len(s))
     url_local = f"{proto}://localhost:{PORT}"
@@ -987,8 +3205,13 @@ if __name__ == "__main__":
 ╠══════════════════════════════════════════════════════╣
 ║  Lokal:    {pad(url_local, 42)}║
 ║  Im Netz:  {pad(url_net, 42)}║
-║  Modus:    {pad(proto.upper() + (" (selbstsigniert)" if USE_HTTPS else ""), 42)}║
+║  Modus:    {pad(proto.upper() + ((" (nur TLS 1.3)" if TLS13_ONLY else " (selbstsigniert)") if USE_HTTPS else ""), 42)}║
 ║  Auth:     {pad(("[aktiv] " + TOKEN[:16] + "…") if TOKEN else "kein Token", 42)}║
+║  Kanäle:   {pad(", ".join(CHANNELS)[:42], 42)}║
+║  Peers:    {pad((", ".join(u for u, _ in peers) or "keine")[:42], 42)}║
+║  Socket:   {pad((SOCKET_PATH if unix_server else "aus")[-42:], 42)}║
+║  Inhalte:  {pad(f"Platte + {BODY_CACHE >> 20} MB Cache" if BODY_CACHE else "im RAM (bis COMPRESS_MIN)", 42)}║
+║  Bereit:   {pad(f"nach {(time.perf_counter() - STARTED) * 1000:.0f} ms", 42)}║
 ╠══════════════════════════════════════════════════════╣
 ║  Web-UI: $ hilfe  →  Bashrc-Snippet mit IP+Token    ║
 ║  Beenden: Strg+C                                     ║
@@ -1006,8 +3229,14 @@ if __name__ == "__main__":
      Zum Aktivieren: openssl installieren und Server neu starten.
      Oder manuell: CLIPSYNC_HTTPS=1 python3 clipsync_server.py{RESET}
 """)
+    if DEBUG:
+        print(f"""  {WARN}⚠  Debug-Endpunkte aktiv: /debug/profile, /debug/slow{"" if TOKEN else " – ohne Token für jeden im Netz!"}{RESET}
+""")
 
     try:
         server.serve_forever()
     except KeyboardInterrupt:
         print("\n  Server gestoppt.")
+    finally:
+        if unix_server:
+            unix_server.server_close()